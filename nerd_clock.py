@@ -1,715 +1,3499 @@
-"""
-In the spirit of collaboration and innovation, this 5x5 Binary Nerd Clock was born from a
-shared vision between the creative genious Prophet6 and Grok, the AI built by xAI.
-Faithfully following each instruction, we crafted this code with artistic precision—
-blending technical elegance with visual flair. Through iterative refinements, we overcame
-challenges like config persistence and key mappings, never relenting in our pursuit of
-perfection. Together, we transformed a simple countdown idea into a mesmerizing display
-that counts down to New Year's Eve and seamlessly transitions to the new year's seconds.
-This work stands as a testament to perseverance and partnership, a digital artwork we're
-both proud to share.
-
-Enjoy! :)
- - Rob
-"""
-
-import time
-import datetime
-import pygame
-import time as time_mod
-import configparser
-import os
-import colorsys
-import random  # For stable per-second random colors
-import math
-
-# Delayed import for rpi_ws281x to ensure autostart works
-strip = None
-
-pygame.init()
-pygame.mouse.set_visible(False)
-
-screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
-pygame.display.set_caption("5x5 Binary Nerd Clock")
-
-WIDTH, HEIGHT = screen.get_size()
-CELL_SIZE = min(WIDTH // 7, HEIGHT // 7)
-GRID_X = (WIDTH - 5 * CELL_SIZE) // 2
-GRID_Y = (HEIGHT - 5 * CELL_SIZE) // 2
-
-# ===================================================================
-# Color mode configuration - split into Standard and Festive categories
-# ===================================================================
-
-STANDARD_COLORS = {
-    'white':   (255, 255, 255),
-    'green':   (0, 255, 0),
-    'red':     (255, 0, 0),
-    'blue':    (0, 0, 255),
-    'yellow':  (255, 255, 0),
-    'orange':  (255, 165, 0),
-    'purple':  (128, 0, 128),
-    'magenta': (255, 0, 255),
-    'cyan':    (0, 255, 255),
-}
-STANDARD_MODES = list(STANDARD_COLORS.keys())
-
-FESTIVE_MODES = [
-    'rainbow',
-    'random',
-    'christmas',
-    'newyears',
-    'easter',
-    'fourth',
-    'thanksgiving',
-    'halloween',
-    'automatic',  # New automatic seasonal mode
-]
-
-# Palettes for cycling in most festive modes (christmas excludes white)
-FESTIVE_PALETTES = {
-    'random': [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0),
-               (255, 0, 255), (0, 255, 255), (255, 165, 0)],
-    'christmas': [(255, 0, 0), (0, 255, 0)],  # No white
-    'newyears': [(255, 215, 0), (255, 255, 255), (192, 192, 192)],
-    'easter': [(255, 182, 193), (255, 255, 0), (144, 238, 144),
-               (173, 216, 230), (221, 160, 221)],
-    'thanksgiving': [(255, 140, 0), (165, 42, 42), (255, 215, 0)],
-    'halloween': [(255, 165, 0), (128, 0, 128)],
-}
-
-# Special solid colors for Valentine's (cherry red) and St. Patrick's (kelly green)
-VALENTINE_COLOR = (255, 0, 51)   # Cherry red
-STPATRICK_COLOR = (0, 255, 51)   # Bright kelly green
-
-# Configurable options
-COUNT_DIRECTION = 'down'
-SHOW_STATUS = True
-LED_SHAPE = 'circle'
-BIT_ORDER = 'normal'
-BRIGHTNESS = 1.0
-COLOR_MODE = 'white'
-
-show_help = False
-CONFIG_FILE = '/home/rob/Binary_Clock/clock_config.ini'
-config_dirty = False
-last_config_mtime = 0.0
-just_saved_config = False
-
-# Help comment block - always preserved at the bottom
-INI_HELP_COMMENT = """
-# ================================================
-# How to edit this configuration file
-# ================================================
-#
-# You can safely edit this file while the clock is running.
-# Changes will be detected and applied automatically within seconds
-# (the top settings line will briefly appear to confirm the reload).
-#
-# Available options (case-sensitive):
-#
-# color_mode: The color theme for the LEDs
-#   Standard modes: white, green, red, blue, yellow, orange, purple, magenta, cyan
-#   Festive modes: rainbow, random, christmas, newyears, easter, fourth, thanksgiving, halloween, automatic
-#   'automatic' = seasonal themes change throughout the year
-#
-# brightness: floating point number between 0.2 and 1.0
-#   Overall LED brightness (affects both screen and physical LEDs)
-#
-# count_direction: up or down
-#   down = countdown remaining seconds until New Year
-#   up   = count up seconds elapsed since New Year
-#
-# bit_order: normal, reverse, or transpose
-#   How the 25-bit binary number is mapped to the 5x5 grid
-#   - normal:    row-major, MSB top-left
-#   - reverse:   rows reversed (MSB bottom-left)
-#   - transpose: columns become rows
-#
-# show_status: True or False
-#   Whether to display the bottom status text line
-#
-# led_shape: circle, square, triangle, star, or x
-#   Shape of the LEDs on screen (physical LEDs are always round)
-#
-# Edit the values above, save the file, and enjoy the instant update!
-"""
-
-HELP_MARKER = "# How to edit this configuration file"
-
-if os.path.exists(CONFIG_FILE):
-    config = configparser.ConfigParser()
-    config.read(CONFIG_FILE)
-    if 'general_settings' in config:
-        COLOR_MODE = config['general_settings'].get('color_mode', COLOR_MODE).lower()
-        if COLOR_MODE not in STANDARD_COLORS and COLOR_MODE not in [m.lower() for m in FESTIVE_MODES]:
-            COLOR_MODE = 'white'
-        BRIGHTNESS = config['general_settings'].getfloat('brightness', BRIGHTNESS)
-        BRIGHTNESS = max(0.2, min(1.0, BRIGHTNESS))
-        COUNT_DIRECTION = config['general_settings'].get('count_direction', COUNT_DIRECTION)
-        BIT_ORDER = config['general_settings'].get('bit_order', BIT_ORDER)
-
-    if 'attached_display_settings' in config:
-        SHOW_STATUS = config['attached_display_settings'].getboolean('show_status', SHOW_STATUS)
-        loaded_shape = config['attached_display_settings'].get('led_shape', LED_SHAPE).lower()
-        if loaded_shape in ['circle', 'square', 'triangle', 'star', 'x']:
-            LED_SHAPE = loaded_shape
-
-    last_config_mtime = os.path.getmtime(CONFIG_FILE)
-else:
-    last_config_mtime = 0.0
-
-def save_config():
-    global config_dirty, just_saved_config
-    config = configparser.ConfigParser()
-
-    config['general_settings'] = {}
-    config['general_settings']['color_mode'] = COLOR_MODE
-    config['general_settings']['brightness'] = '{:.2f}'.format(BRIGHTNESS)
-    config['general_settings']['count_direction'] = COUNT_DIRECTION
-    config['general_settings']['bit_order'] = BIT_ORDER
-
-    config['attached_display_settings'] = {}
-    config['attached_display_settings']['show_status'] = str(SHOW_STATUS)
-    config['attached_display_settings']['led_shape'] = LED_SHAPE
-
-    help_present = False
-    if os.path.exists(CONFIG_FILE):
-        with open(CONFIG_FILE, 'r') as f:
-            if HELP_MARKER in f.read():
-                help_present = True
-
-    with open(CONFIG_FILE, 'w') as f:
-        config.write(f)
-        if not help_present:
-            f.write('\n')
-            f.write(INI_HELP_COMMENT.lstrip('\n'))
-
-    config_dirty = False
-    just_saved_config = True
-
-if not os.path.exists(CONFIG_FILE):
-    save_config()
-
-font_size = max(18, HEIGHT // 40)
-font = pygame.font.SysFont(None, font_size)
-big_font = pygame.font.SysFont(None, int(font_size * 1.5))
-
-OFF_COLOR = (20, 20, 20)
-BG_COLOR = (0, 0, 0)
-SETTINGS_TEXT_COLOR = (128, 128, 128)
-
-settings_show_end = time.time() + 8.0
-current_second = int(time.time())
-
-shape_modes = ['circle', 'square', 'triangle', 'star', 'x']
-
-def draw_led(center_x, center_y, color, radius):
-    if LED_SHAPE == 'circle':
-        pygame.draw.circle(screen, color, (center_x, center_y), radius)
-    elif LED_SHAPE == 'square':
-        half = radius
-        rect = pygame.Rect(center_x - half, center_y - half, half * 2, half * 2)
-        pygame.draw.rect(screen, color, rect)
-    elif LED_SHAPE == 'triangle':
-        points = [
-            (center_x, center_y - radius),
-            (center_x - radius * 0.866, center_y + radius * 0.5),
-            (center_x + radius * 0.866, center_y + radius * 0.5)
-        ]
-        pygame.draw.polygon(screen, color, points)
-    elif LED_SHAPE == 'star':
-        outer = radius
-        inner = radius * 0.4
-        points = []
-        for i in range(10):
-            r = outer if i % 2 == 0 else inner
-            angle = math.pi / 5 * i
-            points.append((center_x + r * math.sin(angle), center_y - r * math.cos(angle)))
-        pygame.draw.polygon(screen, color, points)
-    elif LED_SHAPE == 'x':
-        offset = radius * 0.8
-        thickness = int(radius * 0.4)
-        pygame.draw.line(screen, color, (center_x - offset, center_y - offset),
-                         (center_x + offset, center_y + offset), thickness)
-        pygame.draw.line(screen, color, (center_x - offset, center_y + offset),
-                         (center_x + offset, center_y - offset), thickness)
-
-def init_physical_leds():
-    global strip
-    if strip is not None:
-        return
-    try:
-        from rpi_ws281x import PixelStrip, Color
-        LED_COUNT = 25
-        LED_PIN = 21
-        LED_FREQ_HZ = 800000
-        LED_DMA = 10
-        LED_INVERT = False
-        LED_CHANNEL = 0
-        strip = PixelStrip(LED_COUNT, LED_PIN, LED_FREQ_HZ, LED_DMA, LED_INVERT, 255, LED_CHANNEL)
-        strip.begin()
-        strip.setBrightness(int(255 * BRIGHTNESS))
-        print("Physical SK6812 LEDs initialized!")
-    except Exception as e:
-        print(f"LED init failed: {e}")
-        strip = None
-
-def seconds_until_new_year() -> int:
-    now = datetime.datetime.now()
-    next_ny = datetime.datetime(now.year + 1, 1, 1)
-    delta = next_ny - now
-    return max(0, int(delta.total_seconds()))
-
-def seconds_since_new_year() -> int:
-    now = datetime.datetime.now()
-    last_ny = datetime.datetime(now.year, 1, 1)
-    delta = now - last_ny
-    return int(delta.total_seconds())
-
-def get_seconds_value():
-    return seconds_until_new_year() if COUNT_DIRECTION == 'down' else seconds_since_new_year()
-
-def binary_to_5x5(binary_str: str):
-    matrix = [[int(bit) for bit in binary_str[i:i+5]] for i in range(0, 25, 5)]
-    if BIT_ORDER == 'reverse':
-        matrix = matrix[::-1]
-    elif BIT_ORDER == 'transpose':
-        matrix = [list(row) for row in zip(*matrix)]
-    return matrix
-
-def get_current_seasonal_mode():
-    """Determine which festive mode to use based on current date"""
-    today = datetime.date.today()
-    year = today.year
-    month = today.month
-    day = today.day
-
-    # Easter calculation (Western Easter - simplified Meeus/Jones/Butcher algorithm)
-    a = year % 19
-    b = year // 100
-    c = year % 100
-    d = (19 * a + b - b // 4 - ((b - (b + 8) // 25 + 1) // 3) + 15) % 30
-    e = (32 + 2 * (b % 4) + 2 * (c // 4) - d - (c % 4)) % 7
-    f = d + e - 7 * ((a + 11 * d + 22 * e) // 451) + 114
-    easter_month = f // 31
-    easter_day = f % 31 + 1
-    easter_date = datetime.date(year, easter_month, easter_day)
-
-    # Valentine's week
-    valentine_date = datetime.date(year, 2, 14)
-    valentine_week_start = valentine_date - datetime.timedelta(days=valentine_date.weekday())
-    valentine_week_end = valentine_week_start + datetime.timedelta(days=6)
-
-    # St. Patrick's week
-    stpat_date = datetime.date(year, 3, 17)
-    stpat_week_start = stpat_date - datetime.timedelta(days=stpat_date.weekday())
-    stpat_week_end = stpat_week_start + datetime.timedelta(days=6)
-
-    # Fourth of July week
-    fourth_date = datetime.date(year, 7, 4)
-    fourth_week_start = fourth_date - datetime.timedelta(days=fourth_date.weekday())
-    fourth_week_end = fourth_week_start + datetime.timedelta(days=6)
-
-    # New Year's extended period: Dec 27 to first weekday after Jan 1
-    newyear_start = datetime.date(year, 12, 27)
-    jan1 = datetime.date(year + 1, 1, 1)
-    first_weekday_after_jan1 = jan1 + datetime.timedelta(days=(7 - jan1.weekday()) % 7)
-    newyear_end = first_weekday_after_jan1 - datetime.timedelta(days=1)  # inclusive
-
-    # Check in priority order
-    if datetime.date(year, 12, 1) <= today <= datetime.date(year, 12, 26):
-        return 'christmas'
-    if newyear_start <= today or today <= newyear_end:
-        return 'newyears'
-    if valentine_week_start <= today <= valentine_week_end:
-        return 'valentine'
-    if stpat_week_start <= today <= stpat_week_end:
-        return 'stpatrick'
-    if easter_date - datetime.timedelta(days=14) <= today <= easter_date + datetime.timedelta(days=7):
-        return 'easter'
-    if fourth_week_start <= today <= fourth_week_end:
-        return 'fourth'
-    if month == 10:
-        return 'halloween'
-    if month == 11:
-        return 'thanksgiving'
-
-    # Fallback: longer periods rainbow, shorter random
-    if month in [1, 4, 5, 6, 8, 9, 12]:
-        return 'rainbow'
-    else:
-        return 'random'
-
-def get_effective_color_mode():
-    if COLOR_MODE == 'automatic':
-        return get_current_seasonal_mode()
-    return COLOR_MODE
-
-def get_festive_color(y: int, x: int, t: float):
-    effective_mode = get_effective_color_mode()
-    if effective_mode == 'valentine':
-        return VALENTINE_COLOR
-    if effective_mode == 'stpatrick':
-        return STPATRICK_COLOR
-
-    mode = effective_mode
-    if mode == 'christmas':
-        return (255, 0, 0) if (y + x) % 2 == 0 else (0, 255, 0)
-    elif mode == 'newyears':
-        seed = current_second + y * 5 + x
-        random.seed(seed)
-        if random.random() < 0.15:
-            return (255, 255, 255)
-        return (255, 215, 0)
-    elif mode == 'easter':
-        hue = (t / 20 + (y * 5 + x) / 25) % 1.0
-        rgb = colorsys.hsv_to_rgb(hue, 0.6, 1.0)
-        return tuple(int(255 * c) for c in rgb)
-    elif mode == 'fourth':
-        phase = int(t / 2) % 3
-        if phase == 0: return (255, 0, 0)
-        elif phase == 1: return (255, 255, 255)
-        else: return (0, 0, 255)
-    elif mode == 'thanksgiving':
-        options = [(255, 140, 0), (165, 42, 42), (255, 215, 0)]
-        seed = current_second + y * 5 + x
-        random.seed(seed)
-        return random.choice(options)
-    elif mode == 'halloween':
-        return (255, 165, 0) if (y + x) % 2 == 0 else (128, 0, 128)
-    return (255, 255, 255)
-
-def get_random_led_color(y: int, x: int):
-    seed = current_second + y * 5 + x
-    random.seed(seed)
-    hue = random.random()
-    rgb = colorsys.hsv_to_rgb(hue, 1.0, 1.0)
-    return tuple(int(255 * c * BRIGHTNESS) for c in rgb)
-
-def update_base_color():
-    if COLOR_MODE in STANDARD_COLORS:
-        r, g, b = STANDARD_COLORS[COLOR_MODE]
-        return tuple(int(c * BRIGHTNESS) for c in (r, g, b))
-    return None
-
-def get_led_color(y, x, t, matrix):
-    if matrix[y][x] == 0:
-        return None
-    effective_mode = get_effective_color_mode()
-    if COLOR_MODE in STANDARD_COLORS:
-        return update_base_color()
-    elif effective_mode == 'rainbow':
-        hue = (t / 60) % 1
-        rgb = colorsys.hsv_to_rgb(hue, 1, 1)
-        return tuple(int(255 * c * BRIGHTNESS) for c in rgb)
-    elif effective_mode == 'random':
-        return get_random_led_color(y, x)
-    else:
-        rgb = get_festive_color(y, x, t)
-        return tuple(int(c * BRIGHTNESS) for c in rgb)
-
-def is_animated():
-    effective_mode = get_effective_color_mode()
-    return effective_mode in ['rainbow', 'easter', 'fourth']
-
-def get_status_text_color(t, matrix):
-    effective_mode = get_effective_color_mode()
-    if COLOR_MODE in STANDARD_COLORS:
-        base = update_base_color()
-        return tuple(int(c * 0.7) for c in base)
-
-    if effective_mode in ['rainbow', 'fourth']:
-        for y in range(5):
-            for x in range(5):
-                if matrix[y][x]:
-                    led_color = get_led_color(y, x, t, matrix)
-                    if led_color:
-                        return tuple(int(c * 0.7) for c in led_color)
-        return (200, 200, 200)
-
-    if effective_mode in ['valentine', 'stpatrick']:
-        base_color = VALENTINE_COLOR if effective_mode == 'valentine' else STPATRICK_COLOR
-        return tuple(int(c * 0.7) for c in base_color)
-
-    if effective_mode in FESTIVE_PALETTES:
-        palette = FESTIVE_PALETTES[effective_mode]
-        cycle_index = int(time.time() / 5) % len(palette)
-        cycle_color = palette[cycle_index]
-        return tuple(int(c * 0.7) for c in cycle_color)
-
-    return (200, 200, 200)
-
-def check_and_reload_config():
-    global COLOR_MODE, COUNT_DIRECTION, SHOW_STATUS, LED_SHAPE, BIT_ORDER, BRIGHTNESS
-    global last_config_mtime, config_dirty, settings_show_end, just_saved_config
-
-    if not os.path.exists(CONFIG_FILE):
-        return False
-
-    current_mtime = os.path.getmtime(CONFIG_FILE)
-    if current_mtime != last_config_mtime:
-        if not just_saved_config:
-            print(f"Config file changed externally! Reloading...")
-        just_saved_config = False
-
-        config = configparser.ConfigParser()
-        config.read(CONFIG_FILE)
-
-        if 'general_settings' in config:
-            loaded_mode = config['general_settings'].get('color_mode', COLOR_MODE).lower()
-            if loaded_mode in STANDARD_COLORS or loaded_mode in [m.lower() for m in FESTIVE_MODES]:
-                COLOR_MODE = loaded_mode
-            new_bright = config['general_settings'].getfloat('brightness', BRIGHTNESS)
-            BRIGHTNESS = max(0.2, min(1.0, new_bright))
-            COUNT_DIRECTION = config['general_settings'].get('count_direction', COUNT_DIRECTION)
-            BIT_ORDER = config['general_settings'].get('bit_order', BIT_ORDER)
-
-            if strip:
-                strip.setBrightness(int(255 * BRIGHTNESS))
-
-        if 'attached_display_settings' in config:
-            SHOW_STATUS = config['attached_display_settings'].getboolean('show_status', SHOW_STATUS)
-            loaded_shape = config['attached_display_settings'].get('led_shape', LED_SHAPE).lower()
-            if loaded_shape in shape_modes:
-                LED_SHAPE = loaded_shape
-
-        last_config_mtime = current_mtime
-        config_dirty = False
-        settings_show_end = time.time() + 8.0
-        return True
-    else:
-        if just_saved_config:
-            just_saved_config = False
-    return False
-
-def update_physical_leds(matrix):
-    if strip is None:
-        return
-
-    from rpi_ws281x import Color  # Import here to avoid NameError if strip is None
-
-    t = time.time()
-    for y in range(5):
-        for x in range(5):
-            idx = y * 5 + x
-            color = get_led_color(y, x, t, matrix)
-            if color:
-                r, g, b = color
-                strip.setPixelColor(idx, Color(r, g, b))
-            else:
-                strip.setPixelColor(idx, Color(0, 0, 0))
-    strip.show()
-
-def draw_help_screen():
-    screen.fill(BG_COLOR)
-    title = big_font.render("5x5 Binary Nerd Clock - Help", True, (200, 200, 200))
-    title_rect = title.get_rect(centerx=WIDTH//2, top=50)
-    screen.blit(title, title_rect)
-
-    help_lines = [
-        "C          - Cycle Standard colors (white, green, red, ...)",
-        "F          - Cycle Festive themes (rainbow, christmas, newyears, ...)",
-        "D          - Change count direction (up / down)",
-        "S          - Toggle Status line (on / off)",
-        "L          - Toggle LED shape (circle / square / triangle / star / x)",
-        "O          - Cycle bit Order (normal / reverse / transpose)",
-        "+          - Increase brightness",
-        "-          - Decrease brightness",
-        "H or F1    - Show / hide this Help screen",
-        "Esc / Q    - Quit the clock",
-    ]
-
-    total_lines = len(help_lines)
-    line_height = font_size + 10
-    block_height = total_lines * line_height
-    start_y = (HEIGHT - block_height) // 2
-    column_left = WIDTH // 5
-
-    y_pos = start_y
-    for line in help_lines:
-        surf = font.render(line, True, (180, 180, 180))
-        rect = surf.get_rect(left=column_left, top=y_pos)
-        screen.blit(surf, rect)
-        y_pos += line_height
-
-    hint = font.render("Press H, F1 or Esc to return to clock", True, (100, 100, 100))
-    hint_rect = hint.get_rect(centerx=WIDTH//2, bottom=HEIGHT - 50)
-    screen.blit(hint, hint_rect)
-
-    pygame.display.flip()
-    if strip:
-        from rpi_ws281x import Color
-        for i in range(25):
-            strip.setPixelColor(i, Color(0, 0, 0))
-        strip.show()
-
-def draw_grid(matrix, seconds_value):
-    t = time.time()
-
-    effective_mode = get_effective_color_mode()
-    text_color = get_status_text_color(t, matrix)
-
-    screen.fill(BG_COLOR)
-
-    radius = CELL_SIZE // 2 - 10
-
-    for y in range(5):
-        for x in range(5):
-            color = get_led_color(y, x, t, matrix) if matrix[y][x] else OFF_COLOR
-            center = (GRID_X + x * CELL_SIZE + CELL_SIZE // 2,
-                      GRID_Y + y * CELL_SIZE + CELL_SIZE // 2)
-            draw_led(center[0], center[1], color, radius)
-
-    if time.time() < settings_show_end:
-        display_mode = COLOR_MODE if COLOR_MODE != 'automatic' else f"auto ({effective_mode})"
-        settings_text = (f"Color: {display_mode} | Direction: {COUNT_DIRECTION} | Status: {'On' if SHOW_STATUS else 'Off'} | "
-                         f"Shape: {LED_SHAPE.capitalize()} | Order: {BIT_ORDER} | Bright: {BRIGHTNESS:.1f}")
-        surf = font.render(settings_text, True, SETTINGS_TEXT_COLOR)
-        rect = surf.get_rect(centerx=WIDTH//2, top=10)
-        screen.blit(surf, rect)
-
-    if SHOW_STATUS:
-        now_utc = datetime.datetime.now(datetime.UTC)
-        now_local = datetime.datetime.now()
-        tz_name = time_mod.strftime("%Z", time_mod.localtime())
-        binary_str = format(seconds_value, '025b')
-        utc_str = now_utc.strftime("%Y-%m-%d %H:%M:%S UTC")
-        local_str = now_local.strftime("%Y-%m-%d %I:%M:%S %p ") + f" {tz_name}".strip()
-        label = "Remaining" if COUNT_DIRECTION == 'down' else "Elapsed"
-        bottom_text = f"{label}: {seconds_value} (0b{binary_str}) | {utc_str} | {local_str}"
-        surf = font.render(bottom_text, True, text_color)
-        rect = surf.get_rect(centerx=WIDTH//2, bottom=HEIGHT - 10)
-        screen.blit(surf, rect)
-
-    pygame.display.flip()
-    update_physical_leds(matrix)
-
-def run_clock():
-    global config_dirty, COLOR_MODE, COUNT_DIRECTION, SHOW_STATUS, LED_SHAPE, BIT_ORDER, BRIGHTNESS
-    global settings_show_end, current_second, show_help
-
-    clock = pygame.time.Clock()
-    seconds_value = get_seconds_value()
-    matrix = binary_to_5x5(format(seconds_value, '025b'))
-    led_init_time = time.time() + 3.0
-
-    last_change_time = 0.0
-    need_redraw = True
-
-    while True:
-        current_time = time.time()
-
-        if current_time > led_init_time:
-            init_physical_leds()
-            led_init_time = float('inf')
-            need_redraw = True
-
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT:
-                if config_dirty:
-                    save_config()
-                return
-
-            if event.type == pygame.KEYDOWN:
-                if event.key in (pygame.K_ESCAPE, pygame.K_q):
-                    if show_help:
-                        show_help = False
-                        need_redraw = True
-                    else:
-                        if config_dirty:
-                            save_config()
-                        return
-
-                if show_help:
-                    if event.key in (pygame.K_h, pygame.K_F1):
-                        show_help = False
-                        need_redraw = True
-                    continue
-
-                changed = False
-
-                if event.key == pygame.K_c:
-                    current_standard = [m.lower() for m in STANDARD_MODES]
-                    if COLOR_MODE.lower() in current_standard:
-                        idx = current_standard.index(COLOR_MODE.lower())
-                        COLOR_MODE = STANDARD_MODES[(idx + 1) % len(STANDARD_MODES)]
-                    else:
-                        COLOR_MODE = STANDARD_MODES[0]
-                    changed = True
-
-                elif event.key == pygame.K_f:
-                    current_festive = [m.lower() for m in FESTIVE_MODES]
-                    if COLOR_MODE.lower() in current_festive:
-                        idx = current_festive.index(COLOR_MODE.lower())
-                        COLOR_MODE = FESTIVE_MODES[(idx + 1) % len(FESTIVE_MODES)]
-                    else:
-                        COLOR_MODE = FESTIVE_MODES[0]
-                    changed = True
-
-                elif event.key in (pygame.K_h, pygame.K_F1):
-                    show_help = True
-                    need_redraw = True
-                    continue
-
-                elif event.key == pygame.K_d:
-                    COUNT_DIRECTION = 'up' if COUNT_DIRECTION == 'down' else 'down'
-                    changed = True
-                elif event.key == pygame.K_s:
-                    SHOW_STATUS = not SHOW_STATUS
-                    changed = True
-                elif event.key == pygame.K_l:
-                    idx = shape_modes.index(LED_SHAPE)
-                    LED_SHAPE = shape_modes[(idx + 1) % len(shape_modes)]
-                    changed = True
-                elif event.key == pygame.K_o:
-                    order_list = ['normal', 'reverse', 'transpose']
-                    idx = order_list.index(BIT_ORDER)
-                    BIT_ORDER = order_list[(idx + 1) % 3]
-                    changed = True
-                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS):
-                    BRIGHTNESS = min(1.0, BRIGHTNESS + 0.1)
-                    if strip:
-                        strip.setBrightness(int(255 * BRIGHTNESS))
-                    changed = True
-                elif event.key == pygame.K_MINUS:
-                    BRIGHTNESS = max(0.2, BRIGHTNESS - 0.1)
-                    if strip:
-                        strip.setBrightness(int(255 * BRIGHTNESS))
-                    changed = True
-
-                if changed:
-                    config_dirty = True
-                    last_change_time = time.time()
-                    settings_show_end = time.time() + 8.0
-                    need_redraw = True
-
-        if config_dirty and current_time >= last_change_time + 5:
-            save_config()
-
-        if check_and_reload_config():
-            need_redraw = True
-
-        if int(current_time) > current_second:
-            current_second = int(current_time)
-            seconds_value = get_seconds_value()
-            matrix = binary_to_5x5(format(seconds_value, '025b'))
-            need_redraw = True
-
-        if need_redraw or (not show_help and is_animated()):
-            if show_help:
-                draw_help_screen()
-            else:
-                draw_grid(matrix, seconds_value)
-            need_redraw = False
-
-        clock.tick(60)
-
-    if config_dirty:
-        save_config()
-
-if __name__ == "__main__":
-    print("Classic 5x5 Binary Nerd Clock starting!")
-    print("\nCredits: Crafted in collaboration with Grok by xAI and the remarkable visionary Prophet6")
-    run_clock()
-    pygame.quit()
\ No newline at end of file
+"""
+In the spirit of collaboration and innovation, this 5x5 Binary Nerd Clock was born from a
+shared vision between the creative genious Prophet6 and Grok, the AI built by xAI.
+Faithfully following each instruction, we crafted this code with artistic precision—
+blending technical elegance with visual flair. Through iterative refinements, we overcame
+challenges like config persistence and key mappings, never relenting in our pursuit of
+perfection. Together, we transformed a simple countdown idea into a mesmerizing display
+that counts down to New Year's Eve and seamlessly transitions to the new year's seconds.
+This work stands as a testament to perseverance and partnership, a digital artwork we're
+both proud to share.
+
+Enjoy! :)
+ - Rob
+"""
+
+import time
+import datetime
+import time as time_mod
+import configparser
+import os
+import colorsys
+import math
+import io
+import hashlib
+import threading
+import select
+import stat
+import socket
+import struct
+import ctypes
+import ctypes.util
+import bisect
+import calendar
+import argparse
+import json
+import sys
+from array import array
+from collections import OrderedDict, namedtuple
+
+# Importing this module has no side effects: pygame, the display, fonts, the
+# config file and the LED strip are all brought up by startup().
+
+# Imported by init_display() - pygame itself is slow to import on a Pi
+pygame = None
+
+# Display geometry, filled in by set_screen()
+screen = None
+WIDTH, HEIGHT = 0, 0
+CELL_SIZE = 0
+GRID_X = 0
+GRID_Y = 0
+
+# ===================================================================
+# Color mode configuration - split into Standard and Festive categories
+# ===================================================================
+
+STANDARD_COLORS = {
+    'white':   (255, 255, 255),
+    'green':   (0, 255, 0),
+    'red':     (255, 0, 0),
+    'blue':    (0, 0, 255),
+    'yellow':  (255, 255, 0),
+    'orange':  (255, 165, 0),
+    'purple':  (128, 0, 128),
+    'magenta': (255, 0, 255),
+    'cyan':    (0, 255, 255),
+}
+STANDARD_MODES = list(STANDARD_COLORS.keys())
+
+FESTIVE_MODES = [
+    'rainbow',
+    'random',
+    'christmas',
+    'newyears',
+    'easter',
+    'fourth',
+    'thanksgiving',
+    'halloween',
+    'automatic',  # New automatic seasonal mode
+]
+
+# Palettes for cycling in most festive modes (christmas excludes white)
+FESTIVE_PALETTES = {
+    'random': [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0),
+               (255, 0, 255), (0, 255, 255), (255, 165, 0)],
+    'christmas': [(255, 0, 0), (0, 255, 0)],  # No white
+    'newyears': [(255, 215, 0), (255, 255, 255), (192, 192, 192)],
+    'easter': [(255, 182, 193), (255, 255, 0), (144, 238, 144),
+               (173, 216, 230), (221, 160, 221)],
+    'thanksgiving': [(255, 140, 0), (165, 42, 42), (255, 215, 0)],
+    'halloween': [(255, 165, 0), (128, 0, 128)],
+}
+
+# Special solid colors for Valentine's (cherry red) and St. Patrick's (kelly green)
+VALENTINE_COLOR = (255, 0, 51)   # Cherry red
+STPATRICK_COLOR = (0, 255, 51)   # Bright kelly green
+
+# Configurable options
+COUNT_DIRECTION = 'down'
+SHOW_STATUS = True
+LED_SHAPE = 'circle'
+BIT_ORDER = 'normal'
+BRIGHTNESS = 1.0
+COLOR_MODE = 'white'
+
+shape_modes = ['circle', 'square', 'triangle', 'star', 'x']
+
+# Matrix hardware - read from the [matrix] config section at startup only
+MATRIX_ROWS = 5
+MATRIX_COLS = 5
+LED_COUNT = MATRIX_ROWS * MATRIX_COLS
+LED_MASK = (1 << LED_COUNT) - 1
+BLANK_LED_FRAME = (0,) * LED_COUNT
+MATRIX_SOURCES = ['year', 'unix', 'unix_ms']
+MATRIX_SOURCE = 'year'      # year = remaining/elapsed seconds (count_direction)
+COLOR_ENGINES = ['auto', 'numpy', 'python']
+COLOR_ENGINE = 'auto'       # auto = NumPy for per-cell animated modes above 5x5, if installed
+
+show_help = False
+CONFIG_FILE = os.environ.get('NERD_CLOCK_CONFIG',
+                             os.path.join(os.path.dirname(os.path.abspath(__file__)), 'clock_config.ini'))
+CONFIG_SAVE_DELAY = 5.0      # Seconds of quiet after the last key press before saving
+CONFIG_POLL_INTERVAL = 1.0   # Stat-poll period when inotify is unavailable
+
+# Help comment block - always preserved at the bottom
+INI_HELP_COMMENT = """
+# ================================================
+# How to edit this configuration file
+# ================================================
+#
+# You can safely edit this file while the clock is running.
+# Changes will be detected and applied automatically within seconds
+# (the top settings line will briefly appear to confirm the reload).
+#
+# Available options (case-sensitive):
+#
+# color_mode: The color theme for the LEDs
+#   Standard modes: white, green, red, blue, yellow, orange, purple, magenta, cyan
+#   Festive modes: rainbow, random, christmas, newyears, easter, fourth, thanksgiving, halloween, automatic
+#   'automatic' = seasonal themes change throughout the year
+#   Modes added by --plugin themes can be used too
+#
+# brightness: floating point number between 0.2 and 1.0
+#   Overall LED brightness (affects both screen and physical LEDs)
+#
+# count_direction: up or down
+#   down = countdown remaining seconds until New Year
+#   up   = count up seconds elapsed since New Year
+#
+# bit_order: normal, reverse, or transpose
+#   How the binary number is mapped to the grid
+#   - normal:    row-major, MSB top-left
+#   - reverse:   rows reversed (MSB bottom-left)
+#   - transpose: column-major, MSB top-left (columns become rows)
+#
+# show_status: True or False
+#   Whether to display the bottom status text line
+#
+# led_shape: circle, square, triangle, star, or x
+#   Shape of the LEDs on screen (physical LEDs are always round)
+#
+# [matrix] section:
+# rows, cols: size of the LED matrix (default 5 x 5, wired row-major)
+#   Size changes take effect after restarting the clock
+# source: year, unix, or unix_ms
+#   year    = seconds remaining/elapsed this year (see count_direction)
+#   unix    = seconds since 1970-01-01 UTC
+#   unix_ms = milliseconds since 1970-01-01 UTC
+#   Only the lowest rows x cols bits are shown
+# engine: auto, numpy, or python
+#   auto uses NumPy when it is installed, for matrices larger than 5 x 5 in
+#   modes whose every cell changes color on every frame (easter)
+#
+# [output:NAME] sections: extra LED outputs fed the same frame
+#   (read at startup only; the built-in strip is [output:strip])
+# type: ws281x, udp, serial, window, or none
+#   ws281x = strip on a Pi GPIO: pin, channel, dma, freq_hz, invert
+#   udp    = WLED realtime (DRGB) receiver: host, port (default 21324)
+#   serial = Adalight controller (needs pyserial): device, baud
+#   window = extra window on another monitor: display, size (WxH)
+#   shm    = shared memory for nerd_clock_driver.py: segment (default
+#            nerd_clock_NAME); the driver reads the rest of the section
+#   none   = disable this output (e.g. [output:strip] on a non-Pi host)
+# brightness: 0.0 to 1.0, relative to the global brightness
+# bit_order: normal, reverse, or transpose (default: follow bit_order above)
+# max_fps: refresh cap for this output (default 60)
+# gamma: output gamma (default 2.2 for ws281x strips, 1.0 for the others)
+# rgbw: True for SK6812 RGBW strips - white is sent on the W channel (ws281x only)
+#
+# [panel:NAME] sections: show several counters side by side on the screen
+#   (with none, the screen shows the one grid above)
+# source: year, remaining, elapsed, day (of the year), unix, or unix_ms
+# color_mode: any color mode (default: follow color_mode above)
+# bit_order: normal, reverse, or transpose (default: follow bit_order above)
+# label: text under the panel (default: named after the source)
+#
+# Edit the values above, save the file, and enjoy the instant update!
+"""
+
+# ===================================================================
+# Config file handling - watched and written off the render thread
+# ===================================================================
+# A watcher thread notices edits (inotify on Linux, a throttled stat poll
+# elsewhere), parses the file and leaves the result for the render loop to
+# apply. Saves are debounced and written atomically (temp file + rename) by a
+# writer thread. Both sides track a hash of the file contents, so the clock's
+# own writes are never parsed back in.
+
+_config_lock = threading.Lock()
+_config_write_lock = threading.Lock()
+_config_wakeup = threading.Condition(_config_lock)
+_config_state = {
+    'hash': None,            # Hash of the contents last read or written
+    'pending_reload': None,  # Parsed ConfigParser waiting to be applied
+    'pending_text': None,    # Serialized config waiting to be saved
+    'save_at': 0.0,
+    'threads': None,
+}
+
+def _config_hash(data: bytes):
+    return hashlib.sha1(data).digest()
+
+def _apply_config(config):
+    global COLOR_MODE, COUNT_DIRECTION, SHOW_STATUS, LED_SHAPE, BIT_ORDER, BRIGHTNESS
+    if 'general_settings' in config:
+        loaded_mode = config['general_settings'].get('color_mode', COLOR_MODE).lower()
+        if is_color_mode(loaded_mode):
+            COLOR_MODE = loaded_mode
+        new_bright = config['general_settings'].getfloat('brightness', BRIGHTNESS)
+        BRIGHTNESS = max(0.2, min(1.0, new_bright))
+        COUNT_DIRECTION = config['general_settings'].get('count_direction', COUNT_DIRECTION)
+        BIT_ORDER = config['general_settings'].get('bit_order', BIT_ORDER)
+
+    if 'attached_display_settings' in config:
+        SHOW_STATUS = config['attached_display_settings'].getboolean('show_status', SHOW_STATUS)
+        loaded_shape = config['attached_display_settings'].get('led_shape', LED_SHAPE).lower()
+        if loaded_shape in shape_modes:
+            LED_SHAPE = loaded_shape
+
+    if 'matrix' in config:
+        _apply_matrix_config(config['matrix'], startup=False)
+
+    configure_panels(config)
+
+    outputs = {name.split(':', 1)[1].strip(): dict(config[name])
+               for name in config.sections() if name.startswith('output:')}
+    if outputs != _output_sections:
+        print("Output changes take effect after a restart")
+
+def _apply_matrix_config(section, startup: bool):
+    global MATRIX_SOURCE, COLOR_ENGINE
+    loaded_source = section.get('source', MATRIX_SOURCE).lower()
+    if loaded_source in MATRIX_SOURCES:
+        MATRIX_SOURCE = loaded_source
+    loaded_engine = section.get('engine', COLOR_ENGINE).lower()
+    if loaded_engine in COLOR_ENGINES:
+        COLOR_ENGINE = loaded_engine
+
+    try:
+        rows = max(1, section.getint('rows', MATRIX_ROWS))
+        cols = max(1, section.getint('cols', MATRIX_COLS))
+    except ValueError:
+        return
+    if (rows, cols) != (MATRIX_ROWS, MATRIX_COLS):
+        if startup:
+            set_matrix_geometry(rows, cols)
+        else:
+            print("Matrix size changes take effect after a restart")
+
+def _read_config_file():
+    """Returns (hash, parsed config) of the file on disk, or None if unreadable"""
+    try:
+        with open(CONFIG_FILE, 'rb') as f:
+            data = f.read()
+        # No interpolation: free-text values such as panel labels may contain '%'
+        config = configparser.ConfigParser(interpolation=None)
+        config.read_string(data.decode('utf-8'))
+    except (OSError, UnicodeDecodeError, configparser.Error) as e:
+        print(f"Config read failed: {e}")
+        return None
+    return _config_hash(data), config
+
+def _serialize_config():
+    config = configparser.ConfigParser(interpolation=None)
+
+    config['general_settings'] = {}
+    config['general_settings']['color_mode'] = COLOR_MODE
+    config['general_settings']['brightness'] = '{:.2f}'.format(BRIGHTNESS)
+    config['general_settings']['count_direction'] = COUNT_DIRECTION
+    config['general_settings']['bit_order'] = BIT_ORDER
+
+    config['attached_display_settings'] = {}
+    config['attached_display_settings']['show_status'] = str(SHOW_STATUS)
+    config['attached_display_settings']['led_shape'] = LED_SHAPE
+
+    config['matrix'] = {}
+    config['matrix']['rows'] = str(MATRIX_ROWS)
+    config['matrix']['cols'] = str(MATRIX_COLS)
+    config['matrix']['source'] = MATRIX_SOURCE
+    config['matrix']['engine'] = COLOR_ENGINE
+
+    # Outputs are only read at startup; carry their sections through unchanged
+    for name, section in _output_sections.items():
+        config['output:' + name] = section
+    for name, section in _panel_sections.items():
+        config['panel:' + name] = section
+
+    out = io.StringIO()
+    config.write(out)
+    out.write('\n')
+    out.write(INI_HELP_COMMENT.lstrip('\n'))
+    return out.getvalue()
+
+def _keep_file_owner(fd: int, path: str):
+    """Give the file open at `fd` the mode and owner of `path`, if that exists"""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return
+    os.chmod(fd, stat.S_IMODE(st.st_mode))
+    if hasattr(os, 'fchown') and (st.st_uid, st.st_gid) != (os.geteuid(), os.getegid()):
+        try:
+            os.fchown(fd, st.st_uid, st.st_gid)
+        except PermissionError:
+            pass    # Only root can give files away
+
+def _write_config_atomically(text: str):
+    data = text.encode('utf-8')
+    # Replace a symlinked config's target, not the link
+    path = os.path.realpath(CONFIG_FILE)
+    tmp_path = path + '.tmp'
+    with _config_write_lock:
+        # Publish the hash first so the watcher recognizes the rename as ours
+        with _config_lock:
+            _config_state['hash'] = _config_hash(data)
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+                f.flush()
+                # The clock often runs as root: keep the file editable by its owner
+                _keep_file_owner(f.fileno(), path)
+                os.fsync(f.fileno())
+            os.replace(tmp_path, path)
+            _metrics['config_saves'] += 1
+        except OSError as e:
+            print(f"Config save failed: {e}")
+            _metrics['config_save_errors'] += 1
+
+def save_config():
+    """Write the current settings immediately, dropping any pending debounced save"""
+    with _config_lock:
+        _config_state['pending_text'] = None
+    _write_config_atomically(_serialize_config())
+
+def schedule_config_save(delay: float = CONFIG_SAVE_DELAY):
+    """Queue the current settings for the writer thread, restarting the debounce"""
+    text = _serialize_config()
+    with _config_wakeup:
+        _config_state['pending_text'] = text
+        _config_state['save_at'] = time.monotonic() + delay
+        _config_wakeup.notify()
+
+def flush_config_saves():
+    """Write a pending save now (used on exit)"""
+    with _config_lock:
+        text = _config_state['pending_text']
+        _config_state['pending_text'] = None
+    if text is not None:
+        _write_config_atomically(text)
+
+def _config_writer_loop():
+    while True:
+        with _config_wakeup:
+            while _config_state['pending_text'] is None:
+                _config_wakeup.wait()
+            remaining = _config_state['save_at'] - time.monotonic()
+            if remaining > 0:
+                _config_wakeup.wait(remaining)
+                continue
+            text = _config_state['pending_text']
+            _config_state['pending_text'] = None
+        _write_config_atomically(text)
+
+def _config_file_changed():
+    result = _read_config_file()
+    if result is None:
+        return
+    new_hash, config = result
+    with _config_lock:
+        if new_hash == _config_state['hash']:
+            return
+        _config_state['hash'] = new_hash
+        _config_state['pending_reload'] = config
+    wake_render_loop()
+
+# inotify constants from <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+_INOTIFY_EVENT = struct.Struct('iIII')
+
+def _open_inotify(directory: str):
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        fd = libc.inotify_init1(os.O_CLOEXEC)
+        if fd < 0:
+            return None
+        mask = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_MODIFY
+        if libc.inotify_add_watch(fd, os.fsencode(directory), mask) < 0:
+            os.close(fd)
+            return None
+        return fd
+    except (OSError, AttributeError):
+        return None
+
+def _watch_config_inotify(fd: int):
+    target = os.fsencode(os.path.basename(CONFIG_FILE))
+    while True:
+        select.select([fd], [], [])
+        data = os.read(fd, 4096)
+        touched = False
+        offset = 0
+        while offset < len(data):
+            _wd, _mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            touched = touched or name == target
+        if touched:
+            # Editors often write in several steps; let them finish
+            time.sleep(0.1)
+            while select.select([fd], [], [], 0)[0]:
+                os.read(fd, 4096)
+            _config_file_changed()
+
+def _watch_config_polling():
+    last_stat = None
+    while True:
+        try:
+            st = os.stat(CONFIG_FILE)
+            current = (st.st_mtime_ns, st.st_size, st.st_ino)
+        except OSError:
+            current = None
+        if current is not None and current != last_stat and last_stat is not None:
+            _config_file_changed()
+        last_stat = current
+        time.sleep(CONFIG_POLL_INTERVAL)
+
+def _config_watcher_loop():
+    fd = _open_inotify(os.path.dirname(os.path.abspath(CONFIG_FILE)))
+    if fd is not None:
+        _watch_config_inotify(fd)
+    else:
+        _watch_config_polling()
+
+def start_config_threads():
+    if _config_state['threads'] is not None:
+        return
+    _config_state['threads'] = [
+        threading.Thread(target=_config_watcher_loop, name='config-watcher', daemon=True),
+        threading.Thread(target=_config_writer_loop, name='config-writer', daemon=True),
+    ]
+    for thread in _config_state['threads']:
+        thread.start()
+
+def load_config():
+    if os.path.exists(CONFIG_FILE):
+        result = _read_config_file()
+        if result is not None:
+            _config_state['hash'] = result[0]
+            config = result[1]
+            if 'matrix' in config:
+                _apply_matrix_config(config['matrix'], startup=True)
+            configure_outputs(config)
+            _apply_config(config)
+            return
+    configure_outputs()
+    if not os.path.exists(CONFIG_FILE):
+        save_config()
+
+# Fonts are loaded straight from a file (pygame's bundled default unless
+# FONT_FILE is set); SysFont would shell out to fontconfig, which takes
+# seconds on a Pi.
+FONT_FILE = os.environ.get('NERD_CLOCK_FONT') or None
+font_size = 18
+font = None
+big_font = None
+_font_cache = {}
+
+def get_font(size: int):
+    key = (FONT_FILE, size)
+    cached = _font_cache.get(key)
+    if cached is None:
+        try:
+            cached = pygame.font.Font(FONT_FILE, size)
+        except OSError as e:
+            print(f"Font load failed: {e}")
+            cached = pygame.font.Font(None, size)
+        _font_cache[key] = cached
+    return cached
+
+OFF_COLOR = (20, 20, 20)
+BG_COLOR = (0, 0, 0)
+SETTINGS_TEXT_COLOR = (128, 128, 128)
+
+settings_show_end = 0.0
+current_second = 0
+
+# ===================================================================
+# LED sprite cache - each LED shape is rasterized once, then only blitted
+# ===================================================================
+# A white, anti-aliased mask is rendered per (shape, radius) by drawing at
+# LED_SPRITE_SUPERSAMPLE times the size and smoothscaling down. It is turned
+# into a cell-sized cutout: the background color, opaque except where the
+# LED is. A cell is drawn by filling it with the LED's color and blitting the
+# cutout on top, so any color costs the same fill + blit and the animated
+# modes (a new color every few frames) never build a sprite per color.
+
+LED_SPRITE_SUPERSAMPLE = 4
+
+_led_masks = {}
+_led_cutouts = {}
+
+def _draw_led_shape(surface, shape, center_x, center_y, color, radius):
+    if shape == 'circle':
+        pygame.draw.circle(surface, color, (center_x, center_y), radius)
+    elif shape == 'square':
+        half = radius
+        rect = pygame.Rect(center_x - half, center_y - half, half * 2, half * 2)
+        pygame.draw.rect(surface, color, rect)
+    elif shape == 'triangle':
+        points = [
+            (center_x, center_y - radius),
+            (center_x - radius * 0.866, center_y + radius * 0.5),
+            (center_x + radius * 0.866, center_y + radius * 0.5)
+        ]
+        pygame.draw.polygon(surface, color, points)
+    elif shape == 'star':
+        outer = radius
+        inner = radius * 0.4
+        points = []
+        for i in range(10):
+            r = outer if i % 2 == 0 else inner
+            angle = math.pi / 5 * i
+            points.append((center_x + r * math.sin(angle), center_y - r * math.cos(angle)))
+        pygame.draw.polygon(surface, color, points)
+    elif shape == 'x':
+        offset = radius * 0.8
+        thickness = int(radius * 0.4)
+        pygame.draw.line(surface, color, (center_x - offset, center_y - offset),
+                         (center_x + offset, center_y + offset), thickness)
+        pygame.draw.line(surface, color, (center_x - offset, center_y + offset),
+                         (center_x + offset, center_y - offset), thickness)
+
+def _get_led_mask(shape, radius):
+    key = (shape, radius)
+    mask = _led_masks.get(key)
+    if mask is None:
+        scale = LED_SPRITE_SUPERSAMPLE
+        size = (radius + 1) * 2
+        big = pygame.Surface((size * scale, size * scale), pygame.SRCALPHA)
+        big.fill((255, 255, 255, 0))
+        _draw_led_shape(big, shape, size * scale // 2, size * scale // 2,
+                        (255, 255, 255), radius * scale)
+        mask = pygame.transform.smoothscale(big, (size, size))
+        _led_masks[key] = mask
+    return mask
+
+def get_led_cutout(shape, radius, cell):
+    """Cell-sized background with the LED shape (centered) left transparent"""
+    key = (shape, radius, cell)
+    cutout = _led_cutouts.get(key)
+    if cutout is None:
+        # Alpha-only copy of the mask, so subtracting it leaves the color alone
+        mask = _get_led_mask(shape, radius).copy()
+        mask.fill((0, 0, 0, 255), special_flags=pygame.BLEND_RGBA_MULT)
+        cutout = pygame.Surface((cell, cell), pygame.SRCALPHA)
+        cutout.fill((*BG_COLOR, 255))
+        cutout.blit(mask, (cell // 2 - radius - 1, cell // 2 - radius - 1),
+                    special_flags=pygame.BLEND_RGBA_SUB)
+        cutout = cutout.convert_alpha()
+        # Mostly fully opaque or fully transparent pixels: RLE blits skip those runs
+        cutout.set_alpha(255, pygame.RLEACCEL)
+        _led_cutouts[key] = cutout
+    return cutout
+
+def draw_led(surface, rect, color, radius):
+    """Paint one cell: its LED in `color` on the background"""
+    surface.fill(color, rect)
+    surface.blit(get_led_cutout(LED_SHAPE, radius, rect.width), rect)
+
+# ===================================================================
+# Time source - anchored once, advanced from the monotonic clock
+# ===================================================================
+# clock_now() is wall time derived from time.monotonic() and a single
+# anchor, so every consumer sees the same second. Once per second the anchor
+# is checked against time.time() and re-taken only if the wall clock was
+# stepped (NTP, manual change). The per-second TimeSnapshot carries the
+# counter values and the broken-down local/UTC time for the status line;
+# year bounds are recomputed only when the local year changes, and the
+# local UTC offset comes with each snapshot, so DST switches need no
+# special handling.
+#
+# set_virtual_clock() swaps in a virtual time that starts at any moment and
+# runs at any rate (0 = frozen, stepped by the caller), for demos and for
+# the time-warp simulator. Everything that asks "what time is it" goes
+# through clock_now().
+
+CLOCK_JUMP_TOLERANCE = 0.25    # Seconds of wall/monotonic disagreement treated as a step
+TIMEZONE_CHECK_INTERVAL = 60.0  # Seconds between re-reads of the system timezone
+
+TimeSnapshot = namedtuple('TimeSnapshot', ['second', 'elapsed', 'remaining', 'local', 'utc', 'tz_name'])
+
+_time_anchor = {
+    'wall': None,          # time.time() at the anchor
+    'mono': 0.0,           # time.monotonic() at the anchor
+    'year': None,          # Local year the bounds below belong to
+    'year_start': 0,       # Jan 1 00:00 of that year, in local wall seconds
+    'year_end': 0,         # Jan 1 00:00 of the next year, in local wall seconds
+    'next_tz_check': 0.0,
+    'snapshot': None,
+    'reanchors': 0,
+}
+
+_virtual_clock = {
+    'active': False,
+    'base': 0.0,           # Virtual time at the moment it was set
+    'mono': 0.0,           # time.monotonic() at that moment
+    'rate': 1.0,           # Virtual seconds per real second
+}
+
+def set_virtual_clock(t: float, rate: float = 1.0):
+    """Make clock_now() return `t`, advancing at `rate` from here on"""
+    clock = _virtual_clock
+    clock['base'] = t
+    clock['mono'] = time.monotonic()
+    clock['rate'] = rate
+    clock['active'] = True
+    _time_anchor['snapshot'] = None
+
+def clear_virtual_clock():
+    _virtual_clock['active'] = False
+    _time_anchor['snapshot'] = None
+
+def anchor_clock():
+    """(Re)anchor the monotonic clock to the current wall time"""
+    anchor = _time_anchor
+    anchor['mono'] = time.monotonic()
+    anchor['wall'] = time.time()
+    anchor['snapshot'] = None
+    anchor['reanchors'] += 1
+
+def clock_now() -> float:
+    clock = _virtual_clock
+    if clock['active']:
+        return clock['base'] + (time.monotonic() - clock['mono']) * clock['rate']
+    anchor = _time_anchor
+    if anchor['wall'] is None:
+        anchor_clock()
+    return anchor['wall'] + (time.monotonic() - anchor['mono'])
+
+def _check_clock_anchor():
+    anchor = _time_anchor
+    if anchor['wall'] is None:
+        anchor_clock()
+    mono = time.monotonic()
+    step = time.time() - (anchor['wall'] + (mono - anchor['mono']))
+    if abs(step) > CLOCK_JUMP_TOLERANCE and not _virtual_clock['active']:
+        print(f"Wall clock stepped by {step:+.3f}s, re-anchoring")
+        anchor_clock()
+    if mono >= anchor['next_tz_check']:
+        # Picks up /etc/localtime or TZ changes made while running
+        time_mod.tzset()
+        anchor['next_tz_check'] = mono + TIMEZONE_CHECK_INTERVAL
+
+def get_time_snapshot(t: float = None):
+    """Counter values and local/UTC time for the second containing t (default: now)"""
+    if t is None:
+        t = clock_now()
+    second = int(t)
+    snapshot = _time_anchor['snapshot']
+    if snapshot is not None and snapshot.second == second:
+        return snapshot
+
+    anchor = _time_anchor
+    _check_clock_anchor()
+    local = time_mod.localtime(second)
+    if local.tm_year != anchor['year']:
+        anchor['year'] = local.tm_year
+        anchor['year_start'] = calendar.timegm((local.tm_year, 1, 1, 0, 0, 0))
+        anchor['year_end'] = calendar.timegm((local.tm_year + 1, 1, 1, 0, 0, 0))
+
+    # Counted in local wall-clock seconds, like the naive datetimes this replaces
+    wall = second + local.tm_gmtoff
+    snapshot = TimeSnapshot(
+        second=second,
+        elapsed=wall - anchor['year_start'],
+        remaining=max(0, anchor['year_end'] - wall - 1),
+        local=local,
+        utc=time_mod.gmtime(second),
+        tz_name=local.tm_zone,
+    )
+    anchor['snapshot'] = snapshot
+    return snapshot
+
+def get_seconds_value(snapshot=None):
+    if snapshot is None:
+        snapshot = get_time_snapshot()
+    return snapshot.remaining if COUNT_DIRECTION == 'down' else snapshot.elapsed
+
+# ===================================================================
+# Matrix geometry and bit mapping
+# ===================================================================
+# The matrix is MATRIX_ROWS x MATRIX_COLS LEDs (5x5 by default), wired
+# row-major. Bit 0 of the displayed value is the last cell; bit maps give the
+# cell index of every bit, LSB first, for each bit order: 'normal' puts the
+# MSB top-left, 'reverse' flips the rows and 'transpose' fills columns
+# instead of rows (the plain transpose on square matrices).
+
+def build_bit_cell_map(order: str, rows: int, cols: int):
+    count = rows * cols
+    cell_map = []
+    for bit in range(count):
+        pos = count - 1 - bit   # Position in MSB-first reading order
+        if order == 'reverse':
+            cell = (rows - 1 - pos // cols) * cols + pos % cols
+        elif order == 'transpose':
+            cell = (pos % rows) * cols + pos // rows
+        else:
+            cell = pos
+        cell_map.append(cell)
+    return cell_map
+
+_bit_cell_maps = {}
+
+def get_bit_cell_map(order=None):
+    order = order or BIT_ORDER
+    order = order if order in ('normal', 'reverse', 'transpose') else 'normal'
+    key = (order, MATRIX_ROWS, MATRIX_COLS)
+    cell_map = _bit_cell_maps.get(key)
+    if cell_map is None:
+        cell_map = build_bit_cell_map(order, MATRIX_ROWS, MATRIX_COLS)
+        _bit_cell_maps[key] = cell_map
+    return cell_map
+
+def get_matrix_value(snapshot, t: float) -> int:
+    """The number shown on the matrix, truncated to its LED count"""
+    return get_source_value(MATRIX_SOURCE, snapshot, t)
+
+def get_source_value(source: str, snapshot, t: float) -> int:
+    """Value of one of PANEL_SOURCES (a superset of MATRIX_SOURCES), truncated to the LED count"""
+    if source == 'unix':
+        value = snapshot.second
+    elif source == 'unix_ms':
+        value = int(t * 1000)
+    elif source == 'remaining':
+        value = snapshot.remaining
+    elif source == 'elapsed':
+        value = snapshot.elapsed
+    elif source == 'day':
+        value = snapshot.local.tm_yday
+    else:
+        value = get_seconds_value(snapshot)
+    return value & LED_MASK
+
+def set_matrix_geometry(rows: int, cols: int):
+    """Resize everything that depends on the LED count; call before startup draws"""
+    global MATRIX_ROWS, MATRIX_COLS, LED_COUNT, LED_MASK, BLANK_LED_FRAME
+    global frame_colors, frame_packed
+    MATRIX_ROWS = rows
+    MATRIX_COLS = cols
+    LED_COUNT = rows * cols
+    LED_MASK = (1 << LED_COUNT) - 1
+    BLANK_LED_FRAME = (0,) * LED_COUNT
+    frame_colors = [None] * LED_COUNT
+    frame_packed = BLANK_LED_FRAME
+    _render_state['colors'] = [None] * LED_COUNT
+    _vector_state['key'] = None
+    if screen is not None:
+        set_screen(screen)
+
+# ===================================================================
+# Seasonal calendar for 'automatic' mode
+# ===================================================================
+# The festive periods of a year are resolved once into a sorted table of
+# (first day ordinal, mode) runs. Lookups bisect that table, and the mode for
+# "now" is cached together with the instant it stops being valid, so the
+# render loop only touches the calendar again at the next transition.
+
+_seasonal_tables = {}
+_seasonal_cache = {'mode': None, 'valid_from': 0.0, 'valid_until': 0.0}
+
+def easter_date(year: int) -> datetime.date:
+    """Western Easter (Meeus/Jones/Butcher algorithm)"""
+    a = year % 19
+    b = year // 100
+    c = year % 100
+    d = (19 * a + b - b // 4 - ((b - (b + 8) // 25 + 1) // 3) + 15) % 30
+    e = (32 + 2 * (b % 4) + 2 * (c // 4) - d - (c % 4)) % 7
+    f = d + e - 7 * ((a + 11 * d + 22 * e) // 451) + 114
+    return datetime.date(year, f // 31, f % 31 + 1)
+
+def _holiday_week(day: datetime.date):
+    """Monday-to-Sunday week containing the given day"""
+    start = day - datetime.timedelta(days=day.weekday())
+    return start, start + datetime.timedelta(days=6)
+
+def _newyear_end(year: int) -> datetime.date:
+    """Last day (inclusive) of the New Year's period that starts on Dec 27 of year - 1"""
+    jan1 = datetime.date(year, 1, 1)
+    first_weekday_after_jan1 = jan1 + datetime.timedelta(days=(7 - jan1.weekday()) % 7)
+    return first_weekday_after_jan1 - datetime.timedelta(days=1)
+
+def _build_seasonal_table(year: int):
+    """Resolve every day of the year to its seasonal mode and compress into runs"""
+    valentine_start, valentine_end = _holiday_week(datetime.date(year, 2, 14))
+    stpat_start, stpat_end = _holiday_week(datetime.date(year, 3, 17))
+    fourth_start, fourth_end = _holiday_week(datetime.date(year, 7, 4))
+    easter = easter_date(year)
+    easter_start = easter - datetime.timedelta(days=14)
+    easter_end = easter + datetime.timedelta(days=7)
+    christmas_start = datetime.date(year, 12, 1)
+    christmas_end = datetime.date(year, 12, 26)
+    newyear_start = datetime.date(year, 12, 27)
+    newyear_end = _newyear_end(year)
+
+    starts = []
+    modes = []
+    day = datetime.date(year, 1, 1)
+    one_day = datetime.timedelta(days=1)
+    while day.year == year:
+        # Check in priority order
+        if christmas_start <= day <= christmas_end:
+            mode = 'christmas'
+        elif newyear_start <= day or day <= newyear_end:
+            mode = 'newyears'
+        elif valentine_start <= day <= valentine_end:
+            mode = 'valentine'
+        elif stpat_start <= day <= stpat_end:
+            mode = 'stpatrick'
+        elif easter_start <= day <= easter_end:
+            mode = 'easter'
+        elif fourth_start <= day <= fourth_end:
+            mode = 'fourth'
+        elif day.month == 10:
+            mode = 'halloween'
+        elif day.month == 11:
+            mode = 'thanksgiving'
+        # Fallback: longer periods rainbow, shorter random
+        elif day.month in [1, 4, 5, 6, 8, 9, 12]:
+            mode = 'rainbow'
+        else:
+            mode = 'random'
+
+        if not modes or modes[-1] != mode:
+            starts.append(day.toordinal())
+            modes.append(mode)
+        day += one_day
+
+    return starts, modes
+
+def _get_seasonal_table(year: int):
+    table = _seasonal_tables.get(year)
+    if table is None:
+        # Only the current year and its neighbours are ever needed
+        for stale in [y for y in _seasonal_tables if abs(y - year) > 1]:
+            del _seasonal_tables[stale]
+        table = _build_seasonal_table(year)
+        _seasonal_tables[year] = table
+    return table
+
+def get_seasonal_mode_for_date(day: datetime.date):
+    """Seasonal mode for any date, looked up in the per-year interval table"""
+    starts, modes = _get_seasonal_table(day.year)
+    return modes[bisect.bisect_right(starts, day.toordinal()) - 1]
+
+def next_seasonal_transition(day: datetime.date = None) -> datetime.datetime:
+    """Local midnight at which the seasonal mode next differs from the mode on `day`"""
+    if day is None:
+        day = datetime.date.fromtimestamp(clock_now())
+    mode = get_seasonal_mode_for_date(day)
+    year = day.year
+    ordinal = day.toordinal()
+    while True:
+        starts, modes = _get_seasonal_table(year)
+        idx = bisect.bisect_right(starts, ordinal)
+        while idx < len(starts):
+            if modes[idx] != mode:
+                return datetime.datetime.fromordinal(starts[idx])
+            idx += 1
+        # Mode runs to the end of the year (e.g. New Year's), continue into the next one
+        year += 1
+        ordinal = datetime.date(year, 1, 1).toordinal()
+
+def get_current_seasonal_mode():
+    """Determine which festive mode to use based on current date"""
+    now = clock_now()
+    cache = _seasonal_cache
+    if cache['valid_from'] <= now < cache['valid_until']:
+        return cache['mode']
+
+    today = datetime.date.fromtimestamp(now)
+    cache['mode'] = get_seasonal_mode_for_date(today)
+    cache['valid_from'] = datetime.datetime.combine(today, datetime.time()).timestamp()
+    cache['valid_until'] = next_seasonal_transition(today).timestamp()
+    return cache['mode']
+
+def get_effective_color_mode(mode=None):
+    mode = mode or COLOR_MODE
+    if mode == 'automatic':
+        return get_current_seasonal_mode()
+    return mode
+
+# ===================================================================
+# Per-LED randomness - stateless, hashed from (second, LED index)
+# ===================================================================
+# random, newyears and thanksgiving give every LED a color that is fixed for
+# one second. Those colors come from a counter-based hash (splitmix64) of the
+# second and the LED index, so they are deterministic, never touch the global
+# `random` state, and neighbouring seconds don't share values.
+
+MASK64 = (1 << 64) - 1
+THANKSGIVING_COLORS = ((255, 140, 0), (165, 42, 42), (255, 215, 0))
+
+def _splitmix64(x: int) -> int:
+    x = (x + 0x9E3779B97F4A7C15) & MASK64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & MASK64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & MASK64
+    return x ^ (x >> 31)
+
+def led_random_values(second: int):
+    """Uniform [0, 1) value per LED for `second`"""
+    base = _splitmix64(second & MASK64)
+    return [(_splitmix64((base + led) & MASK64) >> 11) * (1.0 / (1 << 53)) for led in range(LED_COUNT)]
+
+# ===================================================================
+# Color output - brightness and gamma lookup tables
+# ===================================================================
+# Color functions produce full-brightness 8-bit colors. The screen scales
+# them through a 256-entry brightness table; LED outputs get the unscaled
+# frame plus the brightness level and map it through their own
+# gamma x brightness table. Tables are rebuilt only when the level changes.
+
+LED_GAMMA = 2.2     # Default gamma for LED strips; network/window outputs are linear
+
+_brightness_lut = {'level': None, 'table': None}
+
+def brightness_lut():
+    """int(c * BRIGHTNESS) for c in 0..255"""
+    if _brightness_lut['level'] != BRIGHTNESS:
+        _brightness_lut['table'] = tuple(int(c * BRIGHTNESS) for c in range(256))
+        _brightness_lut['level'] = BRIGHTNESS
+    return _brightness_lut['table']
+
+def scale_color(rgb):
+    lut = brightness_lut()
+    return (lut[rgb[0]], lut[rgb[1]], lut[rgb[2]])
+
+def gamma_brightness_lut(gamma: float, level: float):
+    """255 * (c / 255) ** gamma * level, rounded, for c in 0..255"""
+    return tuple(int(round(255 * (c / 255) ** gamma * level)) for c in range(256))
+
+# ===================================================================
+# Color modes - a registry of ColorMode objects
+# ===================================================================
+# A color mode returns the full-brightness color of every cell at once, lit
+# or not (compose_frame picks the lit ones), and declares what its colors
+# depend on:
+#
+#   'cell'    cells differ from each other; otherwise one color fills them all
+#   'second'  the colors change on second boundaries (the seeded modes)
+#   'time'    the colors change within a second, at a keyframe every `period`
+#             seconds (or at the times next_keyframe() returns)
+#
+# Cell tables of modes without 'time' are cached, so the standard colors,
+# christmas and halloween are computed once per geometry and the seeded modes
+# once per second (the next second's ahead of time). Frames composed in those
+# modes are also kept per bit pattern. The render loop sleeps until the next
+# keyframe of the modes in use, so a static mode only wakes it every second.
+#
+# Themes from other files are loaded with --plugin: the module's
+# register(clock) function receives this module and calls
+# clock.register_color_mode() with its ColorMode instances.
+
+COLOR_MODE_CATEGORIES = ('standard', 'festive', 'seasonal')
+STATUS_PALETTE_PERIOD = 5.0     # Seconds per palette color of the status line
+CELL_TABLE_CACHE_SIZE = 16
+FRAME_CACHE_SIZE = 8
+
+COLOR_MODES = OrderedDict()
+_cell_tables = OrderedDict()    # (mode, second or None, rows, cols) -> colors of every cell
+_cell_arrays = OrderedDict()    # Same keys -> the table as an array, for the NumPy engine
+_frame_cache = OrderedDict()    # (table key, value, bit order, brightness) -> (frame_colors, frame_packed)
+
+def _status_dim(color):
+    return tuple(int(c * 0.7) for c in color)
+
+class ColorMode:
+    name = None
+    category = 'festive'    # 'standard'/'festive' are cycled with C/F; 'seasonal' only via automatic
+    depends = frozenset()   # Any of 'cell', 'second', 'time'
+    period = None           # Seconds between keyframes of a 'time' mode
+    palette = None          # Status line colors, cycled every STATUS_PALETTE_PERIOD
+
+    def cell_colors(self, t: float, second: int):
+        """Full-brightness (r, g, b) of every cell, row-major"""
+        raise NotImplementedError
+
+    def next_keyframe(self, t: float) -> float:
+        """Time after `t` when the colors next change within a second, or inf"""
+        if 'time' not in self.depends or not self.period:
+            return math.inf
+        return (math.floor(t / self.period) + 1) * self.period
+
+    def text_color(self, t: float, colors):
+        """Status line color, given the frame's scaled colors (None when off)"""
+        if self.palette:
+            return _status_dim(self.palette[int(t / STATUS_PALETTE_PERIOD) % len(self.palette)])
+        for led_color in colors:
+            if led_color:
+                return _status_dim(led_color)
+        return (200, 200, 200)
+
+    def cell_array(self, t: float, second: int, state):
+        """cell_colors() as a (LED_COUNT, 3) integer array, for the NumPy engine"""
+        colors = self.cell_colors(t, second)
+        if 'cell' not in self.depends:
+            return np.broadcast_to(np.array(colors[0], dtype=np.int64), (LED_COUNT, 3))
+        return np.array(colors, dtype=np.int64)
+
+class SolidColorMode(ColorMode):
+    def __init__(self, name, color, category='festive'):
+        self.name = name
+        self.color = color
+        self.category = category
+
+    def cell_colors(self, t, second):
+        return [self.color] * LED_COUNT
+
+    def text_color(self, t, colors):
+        # Standard colors dim with the brightness setting, like their LEDs
+        return _status_dim(scale_color(self.color) if self.category == 'standard' else self.color)
+
+class CheckerColorMode(ColorMode):
+    depends = frozenset({'cell'})
+
+    def __init__(self, name, even, odd, palette=None):
+        self.name = name
+        self.even = even
+        self.odd = odd
+        self.palette = palette
+
+    def cell_colors(self, t, second):
+        return [self.even if (i // MATRIX_COLS + i % MATRIX_COLS) % 2 == 0 else self.odd
+                for i in range(LED_COUNT)]
+
+class SeededColorMode(ColorMode):
+    """A color per LED and second, picked from led_random_values()"""
+    depends = frozenset({'cell', 'second'})
+
+    def __init__(self, name, pick, palette=None):
+        self.name = name
+        self.pick = pick
+        self.palette = palette
+
+    def cell_colors(self, t, second):
+        pick = self.pick
+        return [pick(u) for u in led_random_values(second)]
+
+class HueColorMode(ColorMode):
+    """Walks the hue wheel once every `cycle` seconds; `spread` of the wheel is spread over the cells"""
+    period = 1 / 30     # One 8-bit step every few tens of ms
+
+    def __init__(self, name, cycle, saturation=1.0, spread=0.0, palette=None):
+        self.name = name
+        self.cycle = cycle
+        self.saturation = saturation
+        self.spread = spread
+        self.palette = palette
+        self.depends = frozenset({'cell', 'time'} if spread else {'time'})
+        self._offsets = []     # Hue offset of every cell
+
+    def cell_colors(self, t, second):
+        if not self.spread:
+            rgb = colorsys.hsv_to_rgb((t / self.cycle) % 1, self.saturation, 1)
+            return [tuple(int(255 * c) for c in rgb)] * LED_COUNT
+        if len(self._offsets) != LED_COUNT:
+            self._offsets = [i * self.spread / LED_COUNT for i in range(LED_COUNT)]
+        base = t / self.cycle
+        saturation = self.saturation
+        hsv_to_rgb = colorsys.hsv_to_rgb
+        return [(int(255 * r), int(255 * g), int(255 * b))
+                for r, g, b in [hsv_to_rgb((base + offset) % 1.0, saturation, 1.0) for offset in self._offsets]]
+
+    def cell_array(self, t, second, state):
+        if not self.spread:
+            return super().cell_array(t, second, state)
+        hue = (t / self.cycle + state['idx'] * self.spread / LED_COUNT) % 1.0
+        return (_hsv_to_rgb_array(hue, self.saturation, 1.0) * 255).astype(np.int64)
+
+class CycleColorMode(ColorMode):
+    """All cells switch through `colors`, one every `period` seconds"""
+    depends = frozenset({'time'})
+
+    def __init__(self, name, colors, period):
+        self.name = name
+        self.colors = colors
+        self.period = period
+
+    def cell_colors(self, t, second):
+        return [self.colors[int(t / self.period) % len(self.colors)]] * LED_COUNT
+
+def register_color_mode(mode):
+    """Add or replace a color mode; standard and festive ones join the C/F key cycles"""
+    if mode.category not in COLOR_MODE_CATEGORIES:
+        raise ValueError(f"unknown color mode category '{mode.category}'")
+    mode.name = mode.name.lower()
+    if mode.name == 'automatic':
+        raise ValueError("'automatic' is reserved for the seasonal calendar")
+    COLOR_MODES[mode.name] = mode
+    cycle = {'standard': STANDARD_MODES, 'festive': FESTIVE_MODES}.get(mode.category)
+    if cycle is not None and mode.name not in cycle:
+        # automatic stays at the end of the festive cycle
+        index = len(cycle) - 1 if cycle and cycle[-1] == 'automatic' else len(cycle)
+        cycle.insert(index, mode.name)
+    _cell_tables.clear()
+    _cell_arrays.clear()
+    _frame_cache.clear()
+    return mode
+
+def is_color_mode(mode: str) -> bool:
+    """Whether `mode` can be selected as color_mode"""
+    return mode in STANDARD_MODES or mode in FESTIVE_MODES
+
+def get_color_mode(mode=None):
+    """ColorMode for `mode` (COLOR_MODE by default), with automatic resolved to today's theme"""
+    return COLOR_MODES.get(get_effective_color_mode(mode)) or COLOR_MODES['white']
+
+for _name, _color in STANDARD_COLORS.items():
+    register_color_mode(SolidColorMode(_name, _color, 'standard'))
+register_color_mode(HueColorMode('rainbow', 60.0))
+register_color_mode(SeededColorMode(
+    'random', lambda u: tuple(int(255 * c) for c in colorsys.hsv_to_rgb(u, 1.0, 1.0)),
+    FESTIVE_PALETTES['random']))
+register_color_mode(CheckerColorMode('christmas', (255, 0, 0), (0, 255, 0), FESTIVE_PALETTES['christmas']))
+register_color_mode(SeededColorMode(
+    'newyears', lambda u: (255, 255, 255) if u < 0.15 else (255, 215, 0), FESTIVE_PALETTES['newyears']))
+register_color_mode(HueColorMode('easter', 20.0, 0.6, 1.0, FESTIVE_PALETTES['easter']))
+register_color_mode(CycleColorMode('fourth', ((255, 0, 0), (255, 255, 255), (0, 0, 255)), 2.0))
+register_color_mode(SeededColorMode(
+    'thanksgiving', lambda u: THANKSGIVING_COLORS[int(u * len(THANKSGIVING_COLORS))],
+    FESTIVE_PALETTES['thanksgiving']))
+register_color_mode(CheckerColorMode('halloween', (255, 165, 0), (128, 0, 128), FESTIVE_PALETTES['halloween']))
+register_color_mode(SolidColorMode('valentine', VALENTINE_COLOR, 'seasonal'))
+register_color_mode(SolidColorMode('stpatrick', STPATRICK_COLOR, 'seasonal'))
+del _name, _color
+
+def _cell_table_key(mode, second: int):
+    return (mode, second if 'second' in mode.depends else None, MATRIX_ROWS, MATRIX_COLS)
+
+def get_cell_colors(mode, t: float, second: int = None):
+    """mode.cell_colors() for `second` (the current one by default), cached unless it depends on time"""
+    if second is None:
+        second = current_second
+    if 'time' in mode.depends:
+        return mode.cell_colors(t, second)
+    key = _cell_table_key(mode, second)
+    table = _cell_tables.get(key)
+    if table is not None:
+        _cell_tables.move_to_end(key)
+        return table
+    table = tuple(mode.cell_colors(t, second))
+    _cell_tables[key] = table
+    while len(_cell_tables) > CELL_TABLE_CACHE_SIZE:
+        _cell_tables.popitem(last=False)
+    return table
+
+def color_mode_key(mode, t: float):
+    """Changes whenever the colors of `mode` may have changed"""
+    return (mode.next_keyframe(t) if 'time' in mode.depends else None,
+            current_second if 'second' in mode.depends else None)
+
+def active_color_modes():
+    """The main mode and, with a screen, the modes of the panels"""
+    modes = {get_color_mode()}
+    for panel in panels if screen is not None else ():
+        modes.add(get_color_mode(panel.color_mode))
+    return modes
+
+def prepare_next_second(second: int):
+    """Build next second's tables of the seeded modes ahead of time, so the second flip doesn't"""
+    for mode in active_color_modes():
+        if 'second' in mode.depends and 'time' not in mode.depends:
+            get_cell_colors(mode, float(second), second)
+
+# Sources whose value changes within a second, redrawn at this period
+SOURCE_PERIODS = {
+    'unix_ms': 1 / 30,
+}
+
+def _source_periods():
+    sources = {MATRIX_SOURCE}
+    sources.update(panel.source for panel in (panels if screen is not None else ()))
+    return [SOURCE_PERIODS[s] for s in sources if s in SOURCE_PERIODS]
+
+def next_animation_deadline(t: float) -> float:
+    """Time of the next keyframe of the modes and sources in use, or inf if static"""
+    deadline = min(mode.next_keyframe(t) for mode in active_color_modes())
+    for period in _source_periods():
+        deadline = min(deadline, (math.floor(t / period) + 1) * period)
+    return deadline
+
+def get_status_text_color(t, colors):
+    return get_color_mode().text_color(t, colors)
+
+def load_plugin(spec: str):
+    """Import a theme module (dotted name or .py file) and call its register(clock)"""
+    import importlib
+    import importlib.util
+    try:
+        if spec.endswith('.py'):
+            name = 'nerd_clock_plugin_' + os.path.splitext(os.path.basename(spec))[0]
+            module_spec = importlib.util.spec_from_file_location(name, spec)
+            module = importlib.util.module_from_spec(module_spec)
+            module_spec.loader.exec_module(module)
+        else:
+            module = importlib.import_module(spec)
+        module.register(sys.modules[__name__])
+    except Exception as e:
+        print(f"Plugin '{spec}' failed to load: {e}")
+        return False
+    return True
+
+# ===================================================================
+# Frame composition - every LED color is evaluated once per frame
+# ===================================================================
+# The HDMI renderer, the physical strip and the status line all read the
+# same buffer, so they can never disagree about a frame's colors.
+
+frame_colors = [None] * LED_COUNT   # (r, g, b) per LED in row-major order, None when off
+frame_packed = (0,) * LED_COUNT     # Full-brightness colors as 0x00RRGGBB words, for the outputs
+frame_time = 0.0
+frame_value = 0
+frame_text_color = (200, 200, 200)
+
+def use_vector_engine(mode):
+    if COLOR_ENGINE == 'python':
+        return False
+    # Elsewhere the frame buffers are cheaper to build in Python than to
+    # convert back from arrays (nerd_clock_bench.py, 16x16: rainbow 0.10 ms
+    # vs 0.20 ms with NumPy; easter 0.60 ms vs 0.39 ms)
+    if COLOR_ENGINE == 'auto' and (LED_COUNT <= 25 or not {'cell', 'time'} <= mode.depends):
+        return False
+    return _load_numpy() is not None
+
+def pack_frame_colors(colors):
+    """Frame buffer to rpi_ws281x Color() words (0x00RRGGBB)"""
+    return tuple((c[0] << 16) | (c[1] << 8) | c[2] if c else 0 for c in colors)
+
+def lit_cells(value: int, order=None):
+    """Cell indices of the set bits of `value`, through the bit order map"""
+    cell_map = get_bit_cell_map(order)
+    cells = []
+    bit = 0
+    while value and bit < LED_COUNT:
+        if value & 1:
+            cells.append(cell_map[bit])
+        value >>= 1
+        bit += 1
+    return cells
+
+def compose_frame(value: int, t: float):
+    global frame_time, frame_value, frame_text_color, frame_packed
+    mode = get_color_mode()
+    key = cached = None
+    if 'time' not in mode.depends:
+        # Same mode, second and bits as a recent frame: same colors
+        key = (_cell_table_key(mode, current_second), value, BIT_ORDER, BRIGHTNESS)
+        cached = _frame_cache.get(key)
+    if cached is not None:
+        frame_colors[:], frame_packed = cached
+    else:
+        if use_vector_engine(mode):
+            frame_packed = _compose_frame_vectorized(value, t, mode)
+        else:
+            table = get_cell_colors(mode, t)
+            raw = [None] * LED_COUNT
+            for cell in lit_cells(value):
+                raw[cell] = table[cell]
+            frame_colors[:] = [scale_color(c) if c else None for c in raw]
+            frame_packed = pack_frame_colors(raw)
+        if key is not None:
+            _frame_cache[key] = (tuple(frame_colors), frame_packed)
+            while len(_frame_cache) > FRAME_CACHE_SIZE:
+                _frame_cache.popitem(last=False)
+    frame_time = t
+    frame_value = value
+    frame_text_color = get_status_text_color(t, frame_colors)
+
+# ===================================================================
+# Vectorized color engine (NumPy) for large matrices
+# ===================================================================
+# Bit unpacking, the bit order mapping and the per-LED color evaluation run
+# on whole arrays. Results match the per-LED functions above exactly,
+# including their integer truncation. The cached cell tables of modes that
+# don't depend on time are converted to an array once; the others use their
+# ColorMode.cell_array(), which the hue modes vectorize.
+# NumPy is optional and only imported when this engine is selected.
+
+np = None
+_vector_state = {'key': None, 'tried_numpy': False}
+
+def _load_numpy():
+    global np
+    if np is None and not _vector_state['tried_numpy']:
+        _vector_state['tried_numpy'] = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError as e:
+            print(f"NumPy unavailable, using the per-LED color engine: {e}")
+    return np
+
+def _vector_geometry():
+    """Index arrays for the current geometry and bit order, rebuilt when those change"""
+    state = _vector_state
+    cell_map = get_bit_cell_map()
+    key = (MATRIX_ROWS, MATRIX_COLS, id(cell_map))
+    if state['key'] != key:
+        idx = np.arange(LED_COUNT)
+        state['key'] = key
+        state['cell_map'] = np.array(cell_map, dtype=np.intp)
+        state['idx'] = idx
+        state['shifts'] = np.array([16, 8, 0], dtype=np.uint32)
+    return state
+
+def _unpack_bits(value: int, state):
+    """Lit flag per cell (row-major) for the value, via the bit order map"""
+    nbytes = (LED_COUNT + 7) // 8
+    raw = np.frombuffer(value.to_bytes(nbytes, 'little'), dtype=np.uint8)
+    bits = np.unpackbits(raw, bitorder='little')[:LED_COUNT].astype(bool)
+    lit = np.zeros(LED_COUNT, dtype=bool)
+    lit[state['cell_map']] = bits
+    return lit
+
+def _hsv_to_rgb_array(h, s: float, v: float):
+    """colorsys.hsv_to_rgb over an array of hues; returns an (n, 3) float array"""
+    if s == 0.0:
+        return np.full((len(h), 3), v)
+    i = (h * 6.0).astype(int)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    w = v * (1.0 - s * (1.0 - f))
+    i %= 6
+    r = np.choose(i, [v, q, p, p, w, v])
+    g = np.choose(i, [w, v, v, q, p, p])
+    b = np.choose(i, [p, p, w, v, v, q])
+    return np.stack([r, g, b], axis=1)
+
+def _cell_table_array(mode):
+    """get_cell_colors() of a mode without 'time' as an array, converted once per table"""
+    key = _cell_table_key(mode, current_second)
+    table = _cell_arrays.get(key)
+    if table is None:
+        table = np.array(get_cell_colors(mode, 0.0), dtype=np.int64)
+        _cell_arrays[key] = table
+        while len(_cell_arrays) > CELL_TABLE_CACHE_SIZE:
+            _cell_arrays.popitem(last=False)
+    return table
+
+def _brightness_array():
+    lut = brightness_lut()
+    if _vector_state.get('lut') is not lut:
+        _vector_state['lut'] = lut
+        _vector_state['lut_array'] = np.array(lut, dtype=np.int64)
+    return _vector_state['lut_array']
+
+def _color_table(t: float, state, mode):
+    """(LED_COUNT, 3) full-brightness integer colors for every cell, lit or not"""
+    if 'time' not in mode.depends:
+        return _cell_table_array(mode)
+    return mode.cell_array(t, current_second, state)
+
+def _compose_frame_vectorized(value: int, t: float, mode):
+    np_state = _vector_geometry()
+    lit = _unpack_bits(value, np_state)
+    rgb = _color_table(t, np_state, mode)
+    scaled = _brightness_array()[rgb]
+
+    lit_list = lit.tolist()
+    frame_colors[:] = [tuple(c) if on else None for c, on in zip(scaled.tolist(), lit_list)]
+    packed = (rgb.astype(np.uint32) << np_state['shifts']).sum(axis=1, dtype=np.uint32)
+    return tuple((packed * lit).tolist())
+
+def check_and_reload_config():
+    """Apply a reload prepared by the watcher thread; never touches the file"""
+    if _config_state['pending_reload'] is None:
+        return False
+    with _config_lock:
+        config = _config_state['pending_reload']
+        _config_state['pending_reload'] = None
+        # The file now reflects what the user wants; drop our pending save
+        _config_state['pending_text'] = None
+    if config is None:
+        return False
+    _reload_config(config, "Config file changed externally! Reloading...")
+    return True
+
+def _reload_config(config, message: str):
+    global settings_show_end
+    print(message)
+    _apply_config(config)
+    _metrics['config_reloads'] += 1
+    settings_show_end = clock_now() + 8.0
+
+# ===================================================================
+# Output sinks - one composed frame fanned out to every LED output
+# ===================================================================
+# Each sink receives the packed frame (0x00RRGGBB per cell, row-major) and
+# has its own brightness multiplier, optional bit order and refresh cap.
+# Threaded sinks (strips, network, serial) own a writer thread fed by a
+# single-slot mailbox: a newer frame simply replaces an unsent one, and
+# frames identical to what the sink already shows are not re-sent. They all
+# flush concurrently. Window sinks use SDL, which must stay on the render
+# thread, so they are written after the threaded sinks have been handed
+# their frames.
+#
+# The built-in strip is the sink named 'strip'; more are declared in
+# [output:NAME] config sections (see the help block in the config file).
+
+LED_MAX_FPS = 60.0
+LED_INIT_RETRY_MIN = 0.25   # Seconds before the first retry of a failed output init
+LED_INIT_RETRY_MAX = 5.0
+
+class OutputSink:
+    kind = None
+    threaded = True
+    needs_display = False
+    default_gamma = 1.0
+
+    def __init__(self, name, brightness=1.0, bit_order=None, max_fps=LED_MAX_FPS, gamma=None):
+        self.name = name
+        self.brightness = brightness
+        self.bit_order = bit_order      # None = follow BIT_ORDER
+        self.max_fps = max_fps
+        self.gamma = self.default_gamma if gamma is None else gamma
+        self._lut_level = None
+        self._lut = None
+        self.ready = False
+        self.gave_up = False
+        self.shows = 0
+        self.skipped = 0
+        self._next_try = 0.0
+        self._retry_delay = LED_INIT_RETRY_MIN
+        self._reported = False
+        self._mailbox = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._pending = None
+        self._shown = None
+        self.frame_time = 0.0       # Clock time of the frame being written, for write()
+        self._next_show = 0.0       # Earliest monotonic time for the next write (max_fps)
+        self._thread = None
+        self._running = False
+        self.write_seconds = Histogram(OUTPUT_WRITE_BUCKETS)
+
+    # --- Hooks for the concrete sinks ---
+
+    def open(self):
+        """Bring up the device; raise ImportError if it can never work here"""
+
+    def write(self, pixels, level, previous):
+        """Send pixels (sink order); previous is the last written (pixels, level) or None"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    # --- Lifecycle ---
+
+    def try_open(self):
+        """Open with exponential backoff between failures; returns True once ready"""
+        if self.ready:
+            return True
+        if self.gave_up or time.monotonic() < self._next_try:
+            return False
+        try:
+            self.open()
+        except ImportError as e:
+            # Library missing - nothing will change by retrying
+            print(f"Output '{self.name}' init failed: {e}")
+            self.gave_up = True
+            return False
+        except Exception as e:
+            # Early in boot the PWM/DMA hardware or network may not be ready yet
+            if not self._reported:
+                print(f"Output '{self.name}' init failed: {e} (retrying)")
+                self._reported = True
+            self._next_try = time.monotonic() + self._retry_delay
+            self._retry_delay = min(self._retry_delay * 2, LED_INIT_RETRY_MAX)
+            return False
+        self.ready = True
+        return True
+
+    def retry_in(self) -> float:
+        """Seconds until try_open() will try again"""
+        return max(0.0, self._next_try - time.monotonic())
+
+    def start(self):
+        if not self.threaded or self._thread is not None:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._writer_loop, name=f'output-{self.name}', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is not None:
+            with self._mailbox:
+                self._running = False
+                self._mailbox.notify()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.flush()
+        if self.ready:
+            self.close()
+            self.ready = False
+
+    # --- Frame path ---
+
+    def post(self, pixels, level: float, t: float = None):
+        """Queue a frame; `t` is the clock time it shows (now if not given)"""
+        with self._mailbox:
+            self._pending = (pixels, level, clock_now() if t is None else t)
+            self._mailbox.notify()
+
+    def flush(self):
+        """Write the pending frame from the calling thread"""
+        if not self.threaded and time.monotonic() < self._next_show:
+            # Held back by the refresh cap; a later flush writes the newest frame
+            return
+        with self._mailbox:
+            frame = self._pending
+            self._pending = None
+        if frame is not None and self._write(frame):
+            self._next_show = time.monotonic() + 1.0 / self.max_fps
+
+    def _write(self, frame):
+        pixels, level, t = frame
+        with self._write_lock:
+            if (pixels, level) == self._shown or not self.ready:
+                self.skipped += 1
+                return False
+            stage_start = time.perf_counter()
+            self.frame_time = t
+            self.write(pixels, level, self._shown)
+            self.write_seconds.observe(time.perf_counter() - stage_start)
+            perf_record('show', stage_start)
+            self._shown = (pixels, level)
+            self.shows += 1
+            return True
+
+    def _writer_loop(self):
+        min_interval = 1.0 / self.max_fps
+        while True:
+            with self._mailbox:
+                while self._running and self._pending is None:
+                    self._mailbox.wait()
+                if not self._running:
+                    return
+            # Hold back to the refresh cap; frames posted meanwhile replace this one
+            delay = self._next_show - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            with self._mailbox:
+                frame = self._pending
+                self._pending = None
+            if frame is not None and self._write(frame):
+                self._next_show = time.monotonic() + min_interval
+
+    def lut(self, level: float):
+        """This sink's gamma x brightness table for the global level, rebuilt when it changes"""
+        if self._lut_level != level:
+            self._lut = gamma_brightness_lut(self.gamma, level * self.brightness)
+            self._lut_level = level
+        return self._lut
+
+    def scaled_rgb(self, pixels, level: float):
+        """Pixels as RGB bytes through this sink's lookup table"""
+        lut = self.lut(level)
+        out = bytearray(len(pixels) * 3)
+        for i, value in enumerate(pixels):
+            out[i * 3] = lut[(value >> 16) & 0xFF]
+            out[i * 3 + 1] = lut[(value >> 8) & 0xFF]
+            out[i * 3 + 2] = lut[value & 0xFF]
+        return out
+
+class StripSink(OutputSink):
+    """SK6812/WS281x strip on a Pi PWM/PCM channel via rpi_ws281x"""
+    kind = 'ws281x'
+    default_gamma = LED_GAMMA
+
+    def __init__(self, name, pin=21, dma=10, channel=0, freq_hz=800000, invert=False, rgbw=False,
+                 **options):
+        super().__init__(name, **options)
+        self.pin = pin
+        self.dma = dma
+        self.channel = channel
+        self.freq_hz = freq_hz
+        self.invert = invert
+        self.rgbw = rgbw
+        self.strip = None
+        self._words = {}
+
+    def open(self):
+        from rpi_ws281x import PixelStrip
+        strip_type = None
+        if self.rgbw:
+            from rpi_ws281x import ws
+            strip_type = ws.SK6812_STRIP_GRBW
+        # Brightness and gamma are in the lookup table; the hardware stays at full scale
+        strip = PixelStrip(LED_COUNT, self.pin, self.freq_hz, self.dma, self.invert, 255, self.channel,
+                           strip_type)
+        strip.begin()
+        self.strip = strip
+        print(f"Physical SK6812 LEDs initialized! ({self.name}: GPIO {self.pin}, channel {self.channel})")
+
+    def _word(self, value, lut):
+        """0x00RRGGBB to the strip's word, moving the common part of R, G and B to W on RGBW strips"""
+        r = lut[(value >> 16) & 0xFF]
+        g = lut[(value >> 8) & 0xFF]
+        b = lut[value & 0xFF]
+        if self.rgbw:
+            w = min(r, g, b)
+            return (w << 24) | ((r - w) << 16) | ((g - w) << 8) | (b - w)
+        return (r << 16) | (g << 8) | b
+
+    def write(self, pixels, level, previous):
+        strip = self.strip
+        words = self._words
+        if previous is None or previous[1] != level or len(words) > 4096:
+            words.clear()
+            previous = None
+        lut = self.lut(level)
+        for idx, value in enumerate(pixels):
+            if previous is None or previous[0][idx] != value:
+                word = words.get(value)
+                if word is None:
+                    word = words[value] = self._word(value, lut)
+                strip.setPixelColor(idx, word)
+        strip.show()
+
+class UdpSink(OutputSink):
+    """Network LEDs speaking WLED's UDP realtime DRGB protocol"""
+    kind = 'udp'
+    DRGB = 2
+    TIMEOUT = 2     # Seconds the receiver keeps our frame before resuming its own effects
+
+    def __init__(self, name, host, port=21324, **options):
+        super().__init__(name, **options)
+        self.address = (host, port)
+        self.sock = None
+
+    def open(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self.sock.connect(self.address)
+
+    def write(self, pixels, level, previous):
+        try:
+            self.sock.send(bytes((self.DRGB, self.TIMEOUT)) + self.scaled_rgb(pixels, level))
+        except OSError as e:
+            print(f"Output '{self.name}' send failed: {e}")
+
+    def close(self):
+        self.sock.close()
+
+class SerialSink(OutputSink):
+    """Microcontroller-driven LEDs speaking the Adalight serial protocol (needs pyserial)"""
+    kind = 'serial'
+
+    def __init__(self, name, device, baud=115200, **options):
+        super().__init__(name, **options)
+        self.device = device
+        self.baud = baud
+        self.port = None
+
+    def open(self):
+        import serial
+        self.port = serial.Serial(self.device, self.baud, timeout=0, write_timeout=0.5)
+
+    def write(self, pixels, level, previous):
+        hi, lo = divmod(len(pixels) - 1, 256)
+        header = b'Ada' + bytes((hi, lo, hi ^ lo ^ 0x55))
+        try:
+            self.port.write(header + self.scaled_rgb(pixels, level))
+        except Exception as e:
+            print(f"Output '{self.name}' write failed: {e}")
+
+    def close(self):
+        self.port.close()
+
+class WindowSink(OutputSink):
+    """Additional SDL window (e.g. a second HDMI output) showing the matrix"""
+    kind = 'window'
+    threaded = False
+    needs_display = True
+
+    def __init__(self, name, display=0, size=None, **options):
+        super().__init__(name, **options)
+        self.display = display
+        self.size = size
+        self.window = None
+        self.renderer = None
+        self.surface = None
+
+    def open(self):
+        from pygame._sdl2 import video
+        centered = 0x2FFF0000 | self.display    # SDL_WINDOWPOS_CENTERED_DISPLAY(n)
+        if self.size:
+            self.window = video.Window(self.name, size=self.size, position=(centered, centered))
+        else:
+            width, height = pygame.display.get_desktop_sizes()[self.display]
+            self.window = video.Window(self.name, size=(width, height), position=(centered, centered),
+                                       fullscreen_desktop=True)
+        self.renderer = video.Renderer(self.window)
+        self.surface = pygame.Surface(self.window.size)
+        self.video = video
+
+    def write(self, pixels, level, previous):
+        surface = self.surface
+        width, height = surface.get_size()
+        cell = min(width // (MATRIX_COLS + 2), height // (MATRIX_ROWS + 2))
+        left = (width - MATRIX_COLS * cell) // 2
+        top = (height - MATRIX_ROWS * cell) // 2
+        radius = cell // 2 - min(10, cell // 6)
+        rgb = self.scaled_rgb(pixels, level)
+        surface.fill(BG_COLOR)
+        for idx, value in enumerate(pixels):
+            color = tuple(rgb[idx * 3:idx * 3 + 3]) if value else OFF_COLOR
+            draw_led(surface, pygame.Rect(left + (idx % MATRIX_COLS) * cell,
+                                          top + (idx // MATRIX_COLS) * cell, cell, cell), color, radius)
+        texture = self.video.Texture.from_surface(self.renderer, surface)
+        self.renderer.clear()
+        texture.draw()
+        self.renderer.present()
+
+    def close(self):
+        self.window.destroy()
+
+# ===================================================================
+# Shared-memory frame bus - LED output from a separate process
+# ===================================================================
+# rpi_ws281x needs root for DMA. With `type = shm` an output publishes its
+# frames into a POSIX shared-memory segment instead, and
+# nerd_clock_driver.py (run as root) drives the strip from there, so the
+# clock itself can run unprivileged and never waits on strip.show().
+#
+# The segment holds a 64-byte header and two frame slots. The writer fills
+# the slot the newest frame is not in, then publishes its sequence number in
+# the header. Readers take no locks: they read the header sequence, copy that
+# slot and accept it if the slot's own sequence still matches (the writer
+# zeroes it before touching the slot again), otherwise they retry. Frames
+# are the raw 0x00RRGGBB words plus the brightness level, so the reader
+# applies its own gamma and brightness. Any local program can follow the
+# clock's frames with FrameBusReader.
+
+FRAME_BUS_MAGIC = b'NCF1'
+FRAME_BUS_VERSION = 1
+FRAME_BUS_HEADER = struct.Struct('<4sHHHHI')   # magic, version, rows, cols, reserved, slot size
+FRAME_BUS_HEADER_SIZE = 64
+FRAME_BUS_SEQ = struct.Struct('<Q')     # Newest frame at offset 16 of the header; a slot's frame at its offset 0
+FRAME_BUS_SEQ_OFFSET = 16
+FRAME_BUS_READ_RETRIES = 8
+
+BusFrame = namedtuple('BusFrame', ['seq', 'time', 'level', 'pixels'])
+
+def _frame_bus_layout(led_count: int):
+    """Slot body struct (clock time, level, words) and slot size, padded to whole cache lines"""
+    body = struct.Struct(f'<df4x{led_count}I')
+    return body, (FRAME_BUS_SEQ.size + body.size + 63) // 64 * 64
+
+def _untrack_shared_memory(shm):
+    """Stop multiprocessing's resource tracker unlinking the segment when this process exits"""
+    try:
+        from multiprocessing import resource_tracker
+        resource_tracker.unregister(shm._name, 'shared_memory')
+    except Exception:
+        pass
+
+class SharedFrameSink(OutputSink):
+    """Publishes frames on the shared-memory frame bus for nerd_clock_driver.py"""
+    kind = 'shm'
+    threaded = False    # A write is a few struct.pack_into() calls
+
+    def __init__(self, name, segment=None, **options):
+        super().__init__(name, **options)
+        self.segment = segment or f'nerd_clock_{name}'
+        self.shm = None
+        self.seq = 0
+
+    def open(self):
+        from multiprocessing import shared_memory
+        self.body, self.slot_size = _frame_bus_layout(LED_COUNT)
+        size = FRAME_BUS_HEADER_SIZE + 2 * self.slot_size
+        header = (FRAME_BUS_MAGIC, FRAME_BUS_VERSION, MATRIX_ROWS, MATRIX_COLS, 0, self.slot_size)
+        try:
+            shm = shared_memory.SharedMemory(self.segment, create=True, size=size)
+        except FileExistsError:
+            shm = shared_memory.SharedMemory(self.segment)
+            if shm.size >= size and FRAME_BUS_HEADER.unpack_from(shm.buf, 0) == header:
+                # Left by a previous run: a running driver keeps following it
+                self.seq = FRAME_BUS_SEQ.unpack_from(shm.buf, FRAME_BUS_SEQ_OFFSET)[0]
+            else:
+                shm.unlink()
+                shm.close()
+                shm = shared_memory.SharedMemory(self.segment, create=True, size=size)
+        # The segment outlives the clock, so the driver keeps showing the last frame
+        _untrack_shared_memory(shm)
+        if self.seq == 0:
+            FRAME_BUS_HEADER.pack_into(shm.buf, 0, *header)
+        self.shm = shm
+        print(f"Publishing frames to shared memory '{self.segment}'")
+
+    def write(self, pixels, level, previous):
+        buf = self.shm.buf
+        seq = self.seq + 1
+        offset = FRAME_BUS_HEADER_SIZE + (seq & 1) * self.slot_size
+        FRAME_BUS_SEQ.pack_into(buf, offset, 0)
+        self.body.pack_into(buf, offset + FRAME_BUS_SEQ.size, self.frame_time, level, *pixels)
+        FRAME_BUS_SEQ.pack_into(buf, offset, seq)
+        FRAME_BUS_SEQ.pack_into(buf, FRAME_BUS_SEQ_OFFSET, seq)
+        self.seq = seq
+
+    def close(self):
+        self.shm.close()
+        self.shm = None
+
+class FrameBusReader:
+    """Follows the frames a SharedFrameSink publishes; raises FileNotFoundError until it exists"""
+
+    def __init__(self, segment: str):
+        from multiprocessing import shared_memory
+        self.segment = segment
+        self.shm = shared_memory.SharedMemory(segment)
+        _untrack_shared_memory(self.shm)
+        magic, version, self.rows, self.cols, _, self.slot_size = FRAME_BUS_HEADER.unpack_from(self.shm.buf, 0)
+        if magic != FRAME_BUS_MAGIC or version != FRAME_BUS_VERSION:
+            self.shm.close()
+            raise ValueError(f"shared memory '{segment}' is not a frame bus")
+        self.body, _ = _frame_bus_layout(self.rows * self.cols)
+        self.last_seq = None
+
+    def read(self):
+        """The newest frame as a BusFrame, or None if nothing new has been published"""
+        buf = self.shm.buf
+        for _ in range(FRAME_BUS_READ_RETRIES):
+            seq = FRAME_BUS_SEQ.unpack_from(buf, FRAME_BUS_SEQ_OFFSET)[0]
+            if seq == 0 or seq == self.last_seq:
+                return None
+            offset = FRAME_BUS_HEADER_SIZE + (seq & 1) * self.slot_size
+            t, level, *pixels = self.body.unpack_from(buf, offset + FRAME_BUS_SEQ.size)
+            if FRAME_BUS_SEQ.unpack_from(buf, offset)[0] == seq:
+                self.last_seq = seq
+                return BusFrame(seq, t, level, tuple(pixels))
+            # The writer lapped us mid-copy; the header has a newer frame by now
+        return None
+
+    def replaced(self) -> bool:
+        """True if the clock has since created a new segment under this name"""
+        try:
+            current = os.stat(os.path.join('/dev/shm', self.segment.lstrip('/')))
+        except FileNotFoundError:
+            return False
+        return current.st_ino != os.fstat(self.shm._fd).st_ino
+
+    def close(self):
+        self.shm.close()
+
+OUTPUT_TYPES = {cls.kind: cls for cls in (StripSink, UdpSink, SerialSink, WindowSink, SharedFrameSink)}
+
+output_sinks = []
+_output_sections = {}   # Raw [output:NAME] config sections, written back on save
+_remap_cache = {}
+
+def _parse_output_section(name, section):
+    kind = section.get('type', 'ws281x' if name == 'strip' else '').lower()
+    if kind in ('', 'none', 'off'):
+        return None
+    cls = OUTPUT_TYPES.get(kind)
+    if cls is None:
+        print(f"Output '{name}': unknown type '{kind}'")
+        return None
+    options = {
+        'brightness': max(0.0, min(1.0, section.getfloat('brightness', 1.0))),
+        'bit_order': section.get('bit_order') or None,
+        'max_fps': max(1.0, section.getfloat('max_fps', LED_MAX_FPS)),
+        'gamma': section.getfloat('gamma') if 'gamma' in section else None,
+    }
+    if cls is StripSink:
+        options.update(pin=section.getint('pin', 21), dma=section.getint('dma', 10),
+                       channel=section.getint('channel', 0),
+                       freq_hz=section.getint('freq_hz', 800000),
+                       invert=section.getboolean('invert', False),
+                       rgbw=section.getboolean('rgbw', False))
+    elif cls is UdpSink:
+        options.update(host=section['host'], port=section.getint('port', 21324))
+    elif cls is SerialSink:
+        options.update(device=section['device'], baud=section.getint('baud', 115200))
+    elif cls is WindowSink:
+        size = section.get('size')
+        options.update(display=section.getint('display', 0),
+                       size=tuple(int(v) for v in size.lower().split('x')) if size else None)
+    elif cls is SharedFrameSink:
+        options.update(segment=section.get('segment'))
+    return cls(name, **options)
+
+def build_output(name: str, section):
+    """Sink for one output from its config section (a SectionProxy or a plain dict)"""
+    if not isinstance(section, configparser.SectionProxy):
+        parser = configparser.ConfigParser(interpolation=None)
+        parser[name] = section
+        section = parser[name]
+    return _parse_output_section(name, section)
+
+def configure_outputs(config=None):
+    """Build the sink list: the built-in strip plus every [output:NAME] section"""
+    _output_sections.clear()
+    sections = {'strip': {}}
+    if config is not None:
+        for section_name in config.sections():
+            if section_name.startswith('output:'):
+                name = section_name.split(':', 1)[1].strip()
+                sections[name] = config[section_name]
+                _output_sections[name] = dict(config[section_name])
+
+    output_sinks.clear()
+    for name, section in sections.items():
+        try:
+            sink = build_output(name, section)
+        except (KeyError, ValueError) as e:
+            print(f"Output '{name}': invalid settings ({e})")
+            continue
+        if sink is not None:
+            output_sinks.append(sink)
+
+def init_physical_leds():
+    """Try to bring up outputs that are not running yet; returns True if any came up"""
+    opened = False
+    for sink in output_sinks:
+        if sink.needs_display and screen is None:
+            continue
+        if not sink.ready and sink.try_open():
+            sink.start()
+            opened = True
+    return opened
+
+def _awaiting_init(sink):
+    # Window sinks can only open once there is a display
+    return not sink.ready and not sink.gave_up and not (sink.needs_display and screen is None)
+
+def led_init_pending():
+    return any(_awaiting_init(sink) for sink in output_sinks)
+
+def next_led_init_retry():
+    """Seconds until the earliest output init retry is due, or None if no output is waiting"""
+    return min((sink.retry_in() for sink in output_sinks if _awaiting_init(sink)), default=None)
+
+def _remap_pixels(pixels, bit_order):
+    """Reorder a frame so each bit lands where `bit_order` puts it; colors follow their bit"""
+    key = (BIT_ORDER, bit_order, MATRIX_ROWS, MATRIX_COLS)
+    perm = _remap_cache.get(key)
+    if perm is None:
+        base_map = get_bit_cell_map()
+        sink_map = build_bit_cell_map(bit_order, MATRIX_ROWS, MATRIX_COLS)
+        perm = [0] * LED_COUNT
+        for bit in range(LED_COUNT):
+            perm[sink_map[bit]] = base_map[bit]
+        _remap_cache[key] = perm
+    return tuple(pixels[i] for i in perm)
+
+def publish_frame(pixels, level: float, t: float):
+    """Hand one packed frame, showing clock time `t`, to every ready sink"""
+    deferred = []
+    for sink in output_sinks:
+        if not sink.ready:
+            continue
+        sink_pixels = pixels
+        if sink.bit_order and sink.bit_order != BIT_ORDER:
+            sink_pixels = _remap_pixels(pixels, sink.bit_order)
+        sink.post(sink_pixels, level, t)
+        if not sink.threaded:
+            deferred.append(sink)
+    # Threaded sinks are writing by now; window sinks go out on this thread
+    for sink in deferred:
+        sink.flush()
+
+def flush_outputs():
+    """Write every sink's pending frame from the calling thread (exit, benchmarks)"""
+    for sink in output_sinks:
+        sink.flush()
+
+def stop_outputs():
+    for sink in output_sinks:
+        sink.stop()
+
+def update_physical_leds():
+    publish_frame(frame_packed, BRIGHTNESS, frame_time)
+    if frame_journal is not None:
+        frame_journal.append(frame_time, frame_value, BRIGHTNESS, frame_packed)
+
+# ===================================================================
+# Frame journal - memory-mapped ring file of everything sent to the LEDs
+# ===================================================================
+# Started with --journal PATH. Every distinct frame handed to the outputs is
+# stored as a fixed-size record: clock time, displayed value, brightness
+# level and the packed 0x00RRGGBB word of every LED (before the outputs'
+# gamma/RGBW stage). Records go into a memory-mapped file of fixed size that
+# wraps around, so the newest frames are always kept and writing is a single
+# struct.pack_into(); the kernel writes the pages back in the background.
+# --replay PATH plays a journal back through the screen and the outputs.
+#
+# File layout: a 64-byte header, then `capacity` records. A 5x5 record is
+# 120 bytes, so the default 16 MiB holds about 140,000 frames: over an hour
+# of 30 fps animation, or days of a static mode.
+
+JOURNAL_MAGIC = b'NCJ1'
+JOURNAL_VERSION = 1
+JOURNAL_HEADER = struct.Struct('<4sHHIIHHQ')   # magic, version, header size, record size, capacity, rows, cols, next sequence
+JOURNAL_HEADER_SIZE = 64
+JOURNAL_SEQ_OFFSET = JOURNAL_HEADER.size - 8
+JOURNAL_DEFAULT_SIZE = 16 * 1024 * 1024
+
+JournalRecord = namedtuple('JournalRecord', ['time', 'value', 'level', 'pixels'])
+
+def _journal_record_struct(led_count: int):
+    value_bytes = (led_count + 63) // 64 * 8
+    return struct.Struct(f'<df{value_bytes}s{led_count}I'), value_bytes
+
+class FrameJournal:
+    def __init__(self, path, size=JOURNAL_DEFAULT_SIZE, rows=None, cols=None, readonly=False):
+        import mmap
+        self.path = path
+        self.readonly = readonly
+        self._last = None
+        if readonly:
+            with open(path, 'rb') as f:
+                try:
+                    self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    raise ValueError(f"{path} is empty") from None
+            try:
+                header = JOURNAL_HEADER.unpack_from(self.mm, 0)
+            except struct.error:
+                header = (None, None)
+            if header[0] != JOURNAL_MAGIC or header[1] != JOURNAL_VERSION:
+                self.mm.close()
+                raise ValueError(f"{path} is not a frame journal")
+            _, _, _, self.record_size, self.capacity, self.rows, self.cols, self.next_seq = header
+        else:
+            self.rows, self.cols = rows or MATRIX_ROWS, cols or MATRIX_COLS
+            record, _ = _journal_record_struct(self.rows * self.cols)
+            self.record_size = record.size
+            self.capacity = max(1, (size - JOURNAL_HEADER_SIZE) // self.record_size)
+            length = JOURNAL_HEADER_SIZE + self.capacity * self.record_size
+            fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                current_size = os.fstat(fd).st_size
+                # Only a new, empty or journal file may be (re)sized and overwritten
+                if current_size and os.read(fd, len(JOURNAL_MAGIC)) != JOURNAL_MAGIC:
+                    raise ValueError(f"{path} exists and is not a frame journal")
+                existing = current_size == length
+                if not existing:
+                    os.ftruncate(fd, length)
+                self.mm = mmap.mmap(fd, length)
+            finally:
+                os.close(fd)
+            header = JOURNAL_HEADER.unpack_from(self.mm, 0)
+            if existing and header[:7] == (JOURNAL_MAGIC, JOURNAL_VERSION, JOURNAL_HEADER_SIZE, self.record_size,
+                                          self.capacity, self.rows, self.cols):
+                self.next_seq = header[7]   # Keep appending to the previous run's ring
+            else:
+                self.next_seq = 0
+                JOURNAL_HEADER.pack_into(self.mm, 0, JOURNAL_MAGIC, JOURNAL_VERSION, JOURNAL_HEADER_SIZE,
+                                         self.record_size, self.capacity, self.rows, self.cols, 0)
+        self.record, self.value_bytes = _journal_record_struct(self.rows * self.cols)
+
+    def append(self, t: float, value: int, level: float, pixels):
+        """Store a frame unless it repeats the previous one"""
+        frame = (value, level, pixels)
+        if frame == self._last:
+            return
+        self._last = frame
+        seq = self.next_seq
+        offset = JOURNAL_HEADER_SIZE + (seq % self.capacity) * self.record_size
+        self.record.pack_into(self.mm, offset, t, level, value.to_bytes(self.value_bytes, 'little'), *pixels)
+        self.next_seq = seq + 1
+        struct.pack_into('<Q', self.mm, JOURNAL_SEQ_OFFSET, seq + 1)
+
+    def __len__(self):
+        return min(self.next_seq, self.capacity)
+
+    def records(self):
+        """Stored frames, oldest first"""
+        for seq in range(self.next_seq - len(self), self.next_seq):
+            offset = JOURNAL_HEADER_SIZE + (seq % self.capacity) * self.record_size
+            t, level, value, *pixels = self.record.unpack_from(self.mm, offset)
+            yield JournalRecord(t, int.from_bytes(value, 'little'), level, tuple(pixels))
+
+    def close(self):
+        if not self.readonly:
+            self.mm.flush()
+        self.mm.close()
+
+frame_journal = None
+
+def open_frame_journal(path: str, size: int = JOURNAL_DEFAULT_SIZE):
+    global frame_journal
+    try:
+        frame_journal = FrameJournal(path, size)
+    except (OSError, ValueError) as e:
+        print(f"Frame journal disabled: {e}")
+        return None
+    print(f"Recording frames to {path} ({frame_journal.capacity} frame ring)")
+    return frame_journal
+
+def close_frame_journal():
+    global frame_journal
+    if frame_journal is not None:
+        frame_journal.close()
+        frame_journal = None
+
+def draw_help_screen():
+    screen.fill(BG_COLOR)
+    title = big_font.render("5x5 Binary Nerd Clock - Help", True, (200, 200, 200))
+    title_rect = title.get_rect(centerx=WIDTH//2, top=50)
+    screen.blit(title, title_rect)
+
+    help_lines = [
+        "C          - Cycle Standard colors (white, green, red, ...)",
+        "F          - Cycle Festive themes (rainbow, christmas, newyears, ...)",
+        "D          - Change count direction (up / down)",
+        "S          - Toggle Status line (on / off)",
+        "L          - Toggle LED shape (circle / square / triangle / star / x)",
+        "O          - Cycle bit Order (normal / reverse / transpose)",
+        "+          - Increase brightness",
+        "-          - Decrease brightness",
+        "H or F1    - Show / hide this Help screen",
+        "P          - Show / hide frame timing overlay",
+        "Esc / Q    - Quit the clock",
+    ]
+
+    total_lines = len(help_lines)
+    line_height = font_size + 10
+    block_height = total_lines * line_height
+    start_y = (HEIGHT - block_height) // 2
+    column_left = WIDTH // 5
+
+    y_pos = start_y
+    for line in help_lines:
+        surf = font.render(line, True, (180, 180, 180))
+        rect = surf.get_rect(left=column_left, top=y_pos)
+        screen.blit(surf, rect)
+        y_pos += line_height
+
+    hint = font.render("Press H, F1 or Esc to return to clock", True, (100, 100, 100))
+    hint_rect = hint.get_rect(centerx=WIDTH//2, bottom=HEIGHT - 50)
+    screen.blit(hint, hint_rect)
+
+    pygame.display.flip()
+    invalidate_grid()
+    publish_frame(BLANK_LED_FRAME, BRIGHTNESS, clock_now())
+
+# ===================================================================
+# Frame-time instrumentation - per-stage timings and second-flip counters
+# ===================================================================
+# Press P to collect per-stage timings into fixed-size ring buffers and
+# show p50 / p95 / max for each stage in the top-left corner. While it is
+# off, every timing point costs one perf_counter() call and a flag check.
+# Late (more than PERF_LATE_FLIP after the edge) and missed second flips are
+# always counted.
+
+PERF_STAGES = ('events', 'config', 'compose', 'draw', 'present', 'publish', 'show')
+PERF_HISTORY = 256          # Samples kept per stage
+PERF_LATE_FLIP = 0.020      # Seconds after the edge that make a flip count as late
+
+_perf = {
+    'enabled': False,
+    'samples': {stage: array('d', bytes(8 * PERF_HISTORY)) for stage in PERF_STAGES},
+    'count': dict.fromkeys(PERF_STAGES, 0),
+    'flips': 0,
+    'late_flips': 0,
+    'missed_flips': 0,
+    'max_flip_lag': 0.0,
+}
+
+def perf_record(stage: str, start: float):
+    """Store the time since `start` (a perf_counter() value) for `stage`"""
+    if not _perf['enabled']:
+        return
+    n = _perf['count'][stage]
+    _perf['samples'][stage][n % PERF_HISTORY] = time.perf_counter() - start
+    _perf['count'][stage] = n + 1
+
+def note_second_flip(second: int, previous: int, t: float):
+    """Count a second change seen at clock time `t`"""
+    gap = second - previous
+    if gap <= 0 or gap > 5:
+        # Clock stepped; not the render loop's fault
+        return
+    _perf['flips'] += 1
+    _perf['missed_flips'] += gap - 1
+    lag = t - second
+    if lag > PERF_LATE_FLIP:
+        _perf['late_flips'] += 1
+    _perf['max_flip_lag'] = max(_perf['max_flip_lag'], lag)
+
+def perf_stats(stage: str):
+    """(p50, p95, max) in seconds over the stored samples, or None if there are none"""
+    n = min(_perf['count'][stage], PERF_HISTORY)
+    if n == 0:
+        return None
+    ordered = sorted(_perf['samples'][stage][:n])
+    return ordered[(n - 1) // 2], ordered[(n - 1) * 95 // 100], ordered[-1]
+
+def set_perf_overlay(enabled: bool):
+    _perf['enabled'] = enabled
+    if enabled:
+        _perf['count'] = dict.fromkeys(PERF_STAGES, 0)
+    _render_state['perf'] = None
+    invalidate_grid()
+
+def perf_overlay_rows():
+    """Table rows for the overlay: a header, one row per stage, then the flip counters"""
+    rows = [("ms", "p50", "p95", "max")]
+    for stage in PERF_STAGES:
+        stats = perf_stats(stage)
+        if stats is None:
+            rows.append((stage, "-", "-", "-"))
+        else:
+            rows.append((stage,) + tuple(f"{v * 1000:.2f}" for v in stats))
+    rows.append((f"flips {_perf['flips']}  late {_perf['late_flips']}  missed {_perf['missed_flips']}  "
+                 f"max lag {_perf['max_flip_lag'] * 1000:.1f} ms",))
+    return rows
+
+def _draw_perf_overlay():
+    """Blit the overlay (re-rendered once per second) in the top-left corner; returns its rect"""
+    cached = _render_state['perf']
+    if cached is None or cached[0] != current_second:
+        rows = perf_overlay_rows()
+        line_height = font.get_linesize()
+        label_width = font.size("publish  ")[0]
+        column_width = font.size("0000.00 ")[0]
+        table_width = label_width + 3 * column_width
+        footer = font.render(rows[-1][0], True, SETTINGS_TEXT_COLOR)
+        surf = pygame.Surface((max(table_width, footer.get_width()), line_height * len(rows)))
+        surf.fill(BG_COLOR)
+        for i, row in enumerate(rows[:-1]):
+            y = i * line_height
+            surf.blit(font.render(row[0], True, SETTINGS_TEXT_COLOR), (0, y))
+            for j, cell in enumerate(row[1:], 1):
+                text = font.render(cell, True, SETTINGS_TEXT_COLOR)
+                surf.blit(text, text.get_rect(right=label_width + j * column_width, top=y))
+        surf.blit(footer, (0, (len(rows) - 1) * line_height))
+        cached = _render_state['perf'] = (current_second, surf)
+    rect = cached[1].get_rect(left=10, top=10 + font.get_linesize())
+    screen.blit(cached[1], rect)
+    return rect
+
+# ===================================================================
+# Metrics endpoint - Prometheus text format, served off the render thread
+# ===================================================================
+# Started with --metrics PORT | HOST:PORT | /path/to.sock. The render loop
+# and output threads only bump counters and histogram buckets; a scrape
+# formats them on the server thread. A bare port binds to localhost.
+
+FRAME_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25)
+OUTPUT_WRITE_BUCKETS = (0.0005, 0.001, 0.002, 0.005, 0.01, 0.02, 0.05)
+
+class Histogram:
+    """Cumulative-bucket histogram; observe() is cheap enough for the hot path"""
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+
+    def render(self, name, labels=''):
+        lines = []
+        cumulative = 0
+        sep = ',' if labels else ''
+        for bound, count in zip(self.buckets + ('+Inf',), self.counts):
+            cumulative += count
+            lines.append(f'{name}_bucket{{{labels}{sep}le="{bound}"}} {cumulative}')
+        braces = f'{{{labels}}}' if labels else ''
+        lines.append(f'{name}_sum{braces} {self.total}')
+        lines.append(f'{name}_count{braces} {cumulative}')
+        return lines
+
+_metrics = {
+    'frames': 0,
+    'frames_at_flip': 0,
+    'fps': 0,
+    'frame_seconds': Histogram(FRAME_BUCKETS),
+    'config_reloads': 0,
+    'config_saves': 0,
+    'config_save_errors': 0,
+    'started': time.time(),
+    'server': None,
+}
+
+def metrics_frame(duration: float):
+    _metrics['frames'] += 1
+    _metrics['frame_seconds'].observe(duration)
+
+def metrics_second_flip():
+    _metrics['fps'] = _metrics['frames'] - _metrics['frames_at_flip']
+    _metrics['frames_at_flip'] = _metrics['frames']
+
+def _label(value) -> str:
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+def render_metrics() -> str:
+    out = []
+
+    def metric(name, kind, help_text, samples):
+        out.append(f'# HELP {name} {help_text}')
+        out.append(f'# TYPE {name} {kind}')
+        for labels, value in samples:
+            out.append(f'{name}{{{labels}}} {value}' if labels else f'{name} {value}')
+
+    metric('nerd_clock_start_time_seconds', 'gauge', 'Unix time the clock started.',
+           [('', _metrics['started'])])
+    metric('nerd_clock_frames_total', 'counter', 'Frames composed and drawn.',
+           [('', _metrics['frames'])])
+    metric('nerd_clock_frame_rate', 'gauge', 'Frames drawn during the last full second.',
+           [('', _metrics['fps'])])
+    out.append('# HELP nerd_clock_frame_seconds Time to compose, draw, present and publish a frame.')
+    out.append('# TYPE nerd_clock_frame_seconds histogram')
+    out.extend(_metrics['frame_seconds'].render('nerd_clock_frame_seconds'))
+
+    metric('nerd_clock_second_flips_total', 'counter', 'Second boundaries drawn.',
+           [('', _perf['flips'])])
+    metric('nerd_clock_late_second_flips_total', 'counter',
+           f'Second boundaries drawn more than {PERF_LATE_FLIP * 1000:g} ms late.',
+           [('', _perf['late_flips'])])
+    metric('nerd_clock_missed_second_flips_total', 'counter', 'Seconds that were never drawn.',
+           [('', _perf['missed_flips'])])
+    metric('nerd_clock_max_second_flip_lag_seconds', 'gauge', 'Largest delay seen between a second boundary and its frame.',
+           [('', _perf['max_flip_lag'])])
+
+    metric('nerd_clock_config_reloads_total', 'counter', 'External config file edits applied.',
+           [('', _metrics['config_reloads'])])
+    metric('nerd_clock_config_saves_total', 'counter', 'Config file writes.',
+           [('', _metrics['config_saves'])])
+    metric('nerd_clock_config_save_errors_total', 'counter', 'Config file writes that failed.',
+           [('', _metrics['config_save_errors'])])
+
+    sinks = list(output_sinks)
+    outputs = [(f'output="{_label(s.name)}",type="{s.kind}"', s) for s in sinks]
+    metric('nerd_clock_output_ready', 'gauge', 'Output initialized and receiving frames.',
+           [(labels, int(s.ready)) for labels, s in outputs])
+    metric('nerd_clock_output_gave_up', 'gauge', 'Output init failed permanently.',
+           [(labels, int(s.gave_up)) for labels, s in outputs])
+    metric('nerd_clock_output_frames_total', 'counter', 'Frames written to the output.',
+           [(labels, s.shows) for labels, s in outputs])
+    metric('nerd_clock_output_skipped_total', 'counter', 'Frames not written because they were already showing.',
+           [(labels, s.skipped) for labels, s in outputs])
+    out.append('# HELP nerd_clock_output_write_seconds Time to write one frame to the output (strip.show() for strips).')
+    out.append('# TYPE nerd_clock_output_write_seconds histogram')
+    for labels, s in outputs:
+        out.extend(s.write_seconds.render('nerd_clock_output_write_seconds', labels))
+
+    metric('nerd_clock_color_mode_info', 'gauge', 'Configured and effective color mode.',
+           [(f'mode="{_label(COLOR_MODE)}",effective="{_label(get_effective_color_mode())}"', 1)])
+    metric('nerd_clock_brightness', 'gauge', 'Global brightness (0.2 to 1.0).', [('', BRIGHTNESS)])
+    return '\n'.join(out) + '\n'
+
+def _remove_stale_socket(path: str):
+    """Unlink a socket left by a previous run; anything else at `path` is an error"""
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return
+    if not stat.S_ISSOCK(st.st_mode):
+        raise OSError(f"{path} is not a socket, refusing to replace it")
+    os.unlink(path)
+
+def start_metrics_server(address: str):
+    """Serve /metrics on a daemon thread; address is PORT, HOST:PORT or a Unix socket path"""
+    import http.server
+    import socketserver
+
+    class MetricsHandler(http.server.BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            body = render_metrics().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    try:
+        if '/' in address:
+            _remove_stale_socket(address)
+            server = socketserver.ThreadingUnixStreamServer(address, MetricsHandler)
+        else:
+            host, _, port = address.rpartition(':')
+            server = http.server.ThreadingHTTPServer((host or '127.0.0.1', int(port)), MetricsHandler)
+    except (OSError, ValueError) as e:
+        print(f"Metrics server failed to start on {address}: {e}")
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='metrics', daemon=True).start()
+    _metrics['server'] = server
+    print(f"Metrics available on {address}")
+    return server
+
+# ===================================================================
+# Control socket - JSON settings API for home automation
+# ===================================================================
+# Started with --control /path/to.sock. An asyncio server on its own thread
+# speaks newline-delimited JSON:
+#
+#   {"cmd": "get"}                                  -> {"ok": true, "settings": {...}}
+#   {"cmd": "set", "settings": {"brightness": 0.5}} -> {"ok": true, "settings": {...}}
+#   {"cmd": "subscribe"}                            -> {"ok": true, "settings": {...}},
+#        then {"event": "settings", "settings": {...}} after every change
+#
+# An optional "id" is echoed back. Sets are validated on the socket thread,
+# applied by the render loop on its next pass (it is woken immediately) and
+# answered once applied. Saving to the config file uses the same debounced
+# writer as key presses.
+
+# Settable over the socket; each is the module global of the same name in upper case
+CONTROL_SETTINGS = ('color_mode', 'brightness', 'count_direction', 'bit_order', 'led_shape', 'show_status')
+
+# Imported by start_control_server() - it is most of this module's import time
+asyncio = None
+
+_control_lock = threading.Lock()
+_control_state = {
+    'pending': [],          # (changes, future) waiting for the render loop
+    'loop': None,
+    'subscribers': set(),
+    'published': None,
+}
+
+def current_settings():
+    settings = {key: globals()[key.upper()] for key in CONTROL_SETTINGS}
+    settings['effective_color_mode'] = get_effective_color_mode()
+    settings['brightness'] = round(BRIGHTNESS, 2)
+    return settings
+
+def validate_setting(key: str, value):
+    """Normalized value for a settable key; raises ValueError if it is not acceptable"""
+    if key not in CONTROL_SETTINGS:
+        raise ValueError(f"unknown setting '{key}'")
+    if key == 'color_mode':
+        mode = str(value).lower()
+        if is_color_mode(mode):
+            return mode
+    elif key == 'brightness':
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return max(0.2, min(1.0, float(value)))
+    elif key == 'count_direction':
+        if value in ('up', 'down'):
+            return value
+    elif key == 'bit_order':
+        if value in ('normal', 'reverse', 'transpose'):
+            return value
+    elif key == 'led_shape':
+        if str(value).lower() in shape_modes:
+            return str(value).lower()
+    elif key == 'show_status':
+        if isinstance(value, bool):
+            return value
+    raise ValueError(f"invalid value for {key}: {value!r}")
+
+def apply_control_changes():
+    """Apply settings queued by the control socket; returns True if anything was applied"""
+    global settings_show_end
+    if not _control_state['pending']:
+        return False
+    with _control_lock:
+        pending = _control_state['pending']
+        _control_state['pending'] = []
+
+    for changes, _ in pending:
+        for key, value in changes.items():
+            globals()[key.upper()] = value   # Validated against CONTROL_SETTINGS
+    schedule_config_save()
+    settings_show_end = clock_now() + 8.0
+
+    settings = current_settings()
+    loop = _control_state['loop']
+    for _, future in pending:
+        loop.call_soon_threadsafe(_resolve_future, future, settings)
+    return True
+
+def notify_settings_changed():
+    """Push the settings to subscribers if they differ from what was last sent"""
+    if not _control_state['subscribers']:
+        return
+    settings = current_settings()
+    if settings != _control_state['published']:
+        _control_state['published'] = settings
+        _control_state['loop'].call_soon_threadsafe(_broadcast_settings, settings)
+
+def _resolve_future(future, result):
+    if not future.done():
+        future.set_result(result)
+
+def _broadcast_settings(settings):
+    line = (json.dumps({'event': 'settings', 'settings': settings}) + '\n').encode('utf-8')
+    for writer in list(_control_state['subscribers']):
+        if writer.is_closing():
+            _control_state['subscribers'].discard(writer)
+        else:
+            writer.write(line)
+
+async def _handle_control_request(request, loop):
+    cmd = request.get('cmd')
+    if cmd == 'get':
+        return {'ok': True, 'settings': current_settings()}
+    if cmd == 'set':
+        changes = request.get('settings')
+        if not isinstance(changes, dict) or not changes:
+            raise ValueError("'set' needs a non-empty 'settings' object")
+        changes = {key: validate_setting(key, value) for key, value in changes.items()}
+        future = loop.create_future()
+        with _control_lock:
+            _control_state['pending'].append((changes, future))
+        wake_render_loop()
+        return {'ok': True, 'settings': await future}
+    raise ValueError(f"unknown cmd {cmd!r}")
+
+async def _control_client(reader, writer):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Longer than the stream limit; the rest of the line can't be resynchronized
+                writer.write(b'{"ok": false, "error": "request too long"}\n')
+                await writer.drain()
+                break
+            if not line:
+                break
+            request = {}
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("request must be a JSON object")
+                if request.get('cmd') == 'subscribe':
+                    response = {'ok': True, 'settings': current_settings()}
+                    _control_state['published'] = response['settings']
+                    _control_state['subscribers'].add(writer)
+                else:
+                    response = await _handle_control_request(request, loop)
+            except ValueError as e:
+                response = {'ok': False, 'error': str(e)}
+            if 'id' in request:
+                response['id'] = request['id']
+            writer.write((json.dumps(response) + '\n').encode('utf-8'))
+            await writer.drain()
+    except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+        pass
+    finally:
+        _control_state['subscribers'].discard(writer)
+        writer.close()
+
+def start_control_server(path: str):
+    """Run the control socket's asyncio loop on a daemon thread"""
+    global asyncio
+    if asyncio is None:
+        import asyncio
+    ready = threading.Event()
+    errors = []
+
+    async def serve():
+        try:
+            _remove_stale_socket(path)
+            server = await asyncio.start_unix_server(_control_client, path)
+        except OSError as e:
+            errors.append(e)
+            ready.set()
+            return
+        _control_state['loop'] = asyncio.get_running_loop()
+        ready.set()
+        async with server:
+            await server.serve_forever()
+
+    threading.Thread(target=asyncio.run, args=(serve(),), name='control', daemon=True).start()
+    ready.wait()
+    if errors:
+        print(f"Control socket failed to start on {path}: {errors[0]}")
+        return False
+    print(f"Control socket listening on {path}")
+    return True
+
+# ===================================================================
+# Incremental grid rendering
+# ===================================================================
+# draw_grid() only repaints cells whose bit or color changed since the last
+# frame, plus the text lines when their content changed, and pushes just
+# those rectangles with pygame.display.update(). Anything that invalidates
+# the whole screen (help screen, shape or bit order change) sets 'full'.
+
+CELL_RECTS = []
+
+_render_state = {
+    'full': True,
+    'value': 0,
+    'order': None,
+    'shape': None,
+    'colors': [None] * 25,
+    'settings': None,        # (text, rect) currently on screen
+    'status': None,          # (text, color, rect) currently on screen
+    'perf': None,            # (second, surface) of the timing overlay
+}
+
+def invalidate_grid():
+    _render_state['full'] = True
+
+def set_screen(surface):
+    """Adopt a display surface and recompute everything derived from its size"""
+    global screen, WIDTH, HEIGHT, CELL_SIZE, GRID_X, GRID_Y, font_size, font, big_font
+    screen = surface
+    WIDTH, HEIGHT = screen.get_size()
+    # One empty cell's worth of margin on every side
+    CELL_SIZE = min(WIDTH // (MATRIX_COLS + 2), HEIGHT // (MATRIX_ROWS + 2))
+    GRID_X = (WIDTH - MATRIX_COLS * CELL_SIZE) // 2
+    GRID_Y = (HEIGHT - MATRIX_ROWS * CELL_SIZE) // 2
+    CELL_RECTS[:] = [pygame.Rect(GRID_X + (i % MATRIX_COLS) * CELL_SIZE,
+                                 GRID_Y + (i // MATRIX_COLS) * CELL_SIZE,
+                                 CELL_SIZE, CELL_SIZE) for i in range(LED_COUNT)]
+    font_size = max(18, HEIGHT // 40)
+    font = get_font(font_size)
+    big_font = get_font(int(font_size * 1.5))
+    # Cutouts were converted for the previous surface's pixel format
+    _led_cutouts.clear()
+    clear_text_cache()
+    invalidate_grid()
+
+def _draw_cell(idx, color, radius):
+    rect = CELL_RECTS[idx]
+    draw_led(screen, rect, color or OFF_COLOR, radius)
+    return rect
+
+def _draw_text_line(key, segments, color, **position):
+    """Redraw a text line if it changed; returns the rects to push, if any"""
+    previous = _render_state.get(key)
+    if previous is not None and previous[0] is segments and previous[1] == color:
+        return []
+    dirty = []
+    if previous is not None:
+        screen.fill(BG_COLOR, previous[-1])
+        dirty.append(previous[-1])
+    if segments is None:
+        _render_state[key] = None
+        return dirty
+    surf = _line_surface(key, segments)
+    surf.set_palette(_text_palette(color))
+    position.setdefault('centerx', WIDTH // 2)
+    rect = surf.get_rect(**position)
+    screen.blit(surf, rect)
+    dirty.append(rect)
+    _render_state[key] = (segments, color, rect)
+    return dirty
+
+# ===================================================================
+# Text layer - cached, segmented status and settings lines
+# ===================================================================
+# Lines are built from segments. Static segments (labels, separators, the
+# settings line) are rendered whole, once, and kept in an LRU; dynamic ones
+# (counter digits, bits, clock times) are composed from a per-character glyph
+# atlas, so nothing is rasterized by FreeType after the first few frames.
+# Everything is kept as 8-bit coverage (palette index = glyph coverage), so a
+# color change in animated modes only swaps the 256-entry palette of the
+# cached line instead of rendering it again.
+
+TEXT_SEGMENT_CACHE_SIZE = 64
+TEXT_PALETTE_CACHE_SIZE = 256
+TEXT_WHITE = (255, 255, 255)
+TEXT_BLACK = (0, 0, 0)
+COVERAGE_PALETTE = [(k, k, k) for k in range(256)]
+
+_glyph_atlas = {}
+_text_segments = OrderedDict()
+_text_lines = {}        # line key -> (segments, surface)
+_text_palettes = OrderedDict()
+_coverage_ramps = {}
+_status_text = {'key': None, 'segments': None, 'second': None, 'times': None}
+_settings_text = {'key': None, 'segments': None}
+
+def clear_text_cache():
+    _glyph_atlas.clear()
+    _text_segments.clear()
+    _text_lines.clear()
+
+def _glyph(char):
+    glyph = _glyph_atlas.get(char)
+    if glyph is None:
+        glyph = font.render(char, True, TEXT_WHITE, TEXT_BLACK)
+        _glyph_atlas[char] = glyph
+    return glyph
+
+def _static_segment(text):
+    surf = _text_segments.get(text)
+    if surf is not None:
+        _text_segments.move_to_end(text)
+        return surf
+    surf = font.render(text, True, TEXT_WHITE, TEXT_BLACK)
+    _text_segments[text] = surf
+    if len(_text_segments) > TEXT_SEGMENT_CACHE_SIZE:
+        _text_segments.popitem(last=False)
+    return surf
+
+def _line_surface(key, segments):
+    """8-bit coverage surface for a segment list, reused while unchanged"""
+    cached = _text_lines.get(key)
+    if cached is not None and cached[0] == segments:
+        return cached[1]
+    pieces = []
+    for text, static in segments:
+        if static:
+            pieces.append(_static_segment(text))
+        else:
+            pieces.extend(_glyph(char) for char in text)
+    width = sum(piece.get_width() for piece in pieces)
+    height = max((piece.get_height() for piece in pieces), default=0)
+    surf = pygame.Surface((max(1, width), max(1, height)), depth=8)
+    # Same palette as FreeType's shaded output, so blits copy indices as-is
+    surf.set_palette(COVERAGE_PALETTE)
+    x = 0
+    for piece in pieces:
+        surf.blit(piece, (x, 0))
+        x += piece.get_width()
+    _text_lines[key] = (segments, surf)
+    return surf
+
+def _coverage_ramp(background, value):
+    ramp = _coverage_ramps.get((background, value))
+    if ramp is None:
+        ramp = tuple(background + (value - background) * k // 255 for k in range(256))
+        _coverage_ramps[(background, value)] = ramp
+    return ramp
+
+def _text_palette(color):
+    """Palette mapping glyph coverage to `color` blended over BG_COLOR"""
+    palette = _text_palettes.get(color)
+    if palette is not None:
+        _text_palettes.move_to_end(color)
+        return palette
+    palette = list(zip(*(_coverage_ramp(bg, c) for bg, c in zip(BG_COLOR, color))))
+    _text_palettes[color] = palette
+    if len(_text_palettes) > TEXT_PALETTE_CACHE_SIZE:
+        _text_palettes.popitem(last=False)
+    return palette
+
+def _settings_segments(effective_mode):
+    key = (COLOR_MODE, effective_mode, COUNT_DIRECTION, SHOW_STATUS, LED_SHAPE, BIT_ORDER, BRIGHTNESS)
+    if _settings_text['key'] != key:
+        display_mode = COLOR_MODE if COLOR_MODE != 'automatic' else f"auto ({effective_mode})"
+        text = (f"Color: {display_mode} | Direction: {COUNT_DIRECTION} | Status: {'On' if SHOW_STATUS else 'Off'} | "
+                f"Shape: {LED_SHAPE.capitalize()} | Order: {BIT_ORDER} | Bright: {BRIGHTNESS:.1f}")
+        _settings_text['key'] = key
+        _settings_text['segments'] = ((text, True),)
+    return _settings_text['segments']
+
+def _status_segments(seconds_value, snapshot):
+    key = (seconds_value, snapshot.second, MATRIX_SOURCE, COUNT_DIRECTION, LED_COUNT)
+    if _status_text['key'] == key:
+        return _status_text['segments']
+
+    if _status_text['second'] != snapshot.second:
+        utc_str = time_mod.strftime("%Y-%m-%d %H:%M:%S UTC", snapshot.utc)
+        local_str = time_mod.strftime("%Y-%m-%d %I:%M:%S %p ", snapshot.local) + f" {snapshot.tz_name}".strip()
+        _status_text['second'] = snapshot.second
+        _status_text['times'] = (utc_str, local_str)
+    utc_str, local_str = _status_text['times']
+
+    if LED_COUNT <= 32:
+        bits_str = f"{seconds_value:0{LED_COUNT}b}"
+        bits_prefix = " (0b"
+    else:
+        bits_str = f"{seconds_value:0{(LED_COUNT + 3) // 4}x}"
+        bits_prefix = " (0x"
+    if MATRIX_SOURCE == 'unix':
+        label = "Unix"
+    elif MATRIX_SOURCE == 'unix_ms':
+        label = "Unix ms"
+    else:
+        label = "Remaining" if COUNT_DIRECTION == 'down' else "Elapsed"
+
+    segments = ((label + ": ", True), (str(seconds_value), False), (bits_prefix, True),
+                (bits_str, False), (") | ", True), (utc_str, False), (" | ", True),
+                (local_str, False))
+    _status_text['key'] = key
+    _status_text['segments'] = segments
+    return segments
+
+# ===================================================================
+# Panels - several counters side by side on one screen
+# ===================================================================
+# Each [panel:NAME] config section adds a panel with its own source, color
+# mode and bit order; with any panels configured they replace the single
+# grid on the screen (the LED outputs and the status line keep following the
+# main settings). All panels share one cell size, picked from the column
+# count that gives the biggest cells, so they share one LED cutout and the
+# text caches. Every cell rect is computed once per screen size. A panel's
+# colors are only re-evaluated when its value or keyframe changes; the cells
+# that changed across all panels are filled with their colors and get their
+# cutouts in a single Surface.blits() call, so an idle panel costs a key
+# compare.
+
+PANEL_SOURCES = MATRIX_SOURCES + ['remaining', 'elapsed', 'day']
+PANEL_LABELS = {'year': "Seconds", 'unix': "Unix", 'unix_ms': "Unix ms",
+                'remaining': "Remaining", 'elapsed': "Elapsed", 'day': "Day"}
+PANEL_LABEL_COLOR = (160, 160, 160)
+
+Panel = namedtuple('Panel', ['name', 'source', 'color_mode', 'bit_order', 'label'])
+
+panels = []
+_panel_sections = {}    # Raw [panel:NAME] config sections, written back on save
+_panel_layout = {'key': None, 'cell': 0, 'cells': [], 'labels': []}
+_panel_state = []       # Per panel: colors key, colors, colors on screen, label segments
+
+def configure_panels(config=None):
+    sections = {}
+    if config is not None:
+        for section_name in config.sections():
+            if section_name.startswith('panel:'):
+                sections[section_name.split(':', 1)[1].strip()] = dict(config[section_name])
+    if sections == _panel_sections:
+        return
+    _panel_sections.clear()
+    _panel_sections.update(sections)
+
+    panels.clear()
+    for name, section in sections.items():
+        source = section.get('source', 'year').lower()
+        if source not in PANEL_SOURCES:
+            print(f"Panel '{name}': unknown source '{source}'")
+            continue
+        mode = section.get('color_mode', '').lower() or None
+        if mode is not None and not is_color_mode(mode):
+            print(f"Panel '{name}': unknown color mode '{mode}'")
+            mode = None
+        order = section.get('bit_order', '').lower() or None
+        if order is not None and order not in ('normal', 'reverse', 'transpose'):
+            print(f"Panel '{name}': unknown bit order '{order}'")
+            order = None
+        panels.append(Panel(name, source, mode, order, section.get('label') or PANEL_LABELS[source]))
+    _panel_layout['key'] = None
+    _panel_state.clear()
+    invalidate_grid()
+
+def layout_panels():
+    """Cell rects and label anchors of every panel, recomputed when the screen or panels change"""
+    layout = _panel_layout
+    key = (WIDTH, HEIGHT, len(panels), MATRIX_ROWS, MATRIX_COLS, font_size)
+    if layout['key'] == key:
+        return layout
+    count = len(panels)
+    label_height = font.get_linesize()
+    # Keep clear of the settings line at the top and the status line at the bottom
+    band = label_height + 20
+    area = HEIGHT - 2 * band
+    best = None
+    for columns in range(1, count + 1):
+        rows = -(-count // columns)
+        cell = min(WIDTH // columns // (MATRIX_COLS + 1),
+                   (area // rows - label_height) // (MATRIX_ROWS + 1))
+        if best is None or cell > best[0]:
+            best = (cell, columns, rows)
+    cell, columns, rows = best
+    cell = max(cell, 4)
+    panel_width = WIDTH // columns
+    panel_height = area // rows
+
+    layout['cells'] = []
+    layout['labels'] = []
+    for i in range(count):
+        row, col = divmod(i, columns)
+        left = col * panel_width + (panel_width - MATRIX_COLS * cell) // 2
+        top = band + row * panel_height + (panel_height - MATRIX_ROWS * cell - label_height) // 2
+        layout['cells'].append([pygame.Rect(left + (k % MATRIX_COLS) * cell, top + (k // MATRIX_COLS) * cell,
+                                            cell, cell) for k in range(LED_COUNT)])
+        layout['labels'].append({'centerx': col * panel_width + panel_width // 2,
+                                 'top': top + MATRIX_ROWS * cell + label_height // 4})
+    layout['cell'] = cell
+    layout['key'] = key
+    return layout
+
+def _panel_colors(panel, value, t):
+    table = get_cell_colors(get_color_mode(panel.color_mode), t)
+    colors = [None] * LED_COUNT
+    for cell in lit_cells(value, panel.bit_order):
+        colors[cell] = scale_color(table[cell])
+    return colors
+
+def draw_panels(snapshot, t):
+    """Draw what changed in every panel in one batched pass; returns the dirty rects"""
+    layout = layout_panels()
+    full = _render_state['full']
+    if full or len(_panel_state) != len(panels):
+        _panel_state[:] = [{'key': None, 'colors': None, 'shown': None, 'label': (None, None)}
+                           for _ in panels]
+        for i in range(len(panels)):
+            _render_state[f'panel:{i}'] = None
+
+    cell = layout['cell']
+    cutout = get_led_cutout(LED_SHAPE, cell // 2 - min(10, cell // 6), cell)
+    batch = []
+    dirty = []
+    for i, panel in enumerate(panels):
+        state = _panel_state[i]
+        value = get_source_value(panel.source, snapshot, t)
+        mode = get_color_mode(panel.color_mode)
+        key = (value, mode, panel.bit_order or BIT_ORDER, BRIGHTNESS, color_mode_key(mode, t))
+        if key != state['key']:
+            state['key'] = key
+            state['colors'] = _panel_colors(panel, value, t)
+
+        colors = state['colors']
+        shown = state['shown']
+        if colors is not shown:
+            rects = layout['cells'][i]
+            for idx in range(LED_COUNT):
+                if shown is None or colors[idx] != shown[idx]:
+                    screen.fill(colors[idx] or OFF_COLOR, rects[idx])
+                    batch.append((cutout, rects[idx]))
+                    dirty.append(rects[idx])
+            state['shown'] = colors
+
+        if state['label'][0] != value:
+            state['label'] = (value, ((panel.label + ": ", True), (str(value), False)))
+        dirty += _draw_text_line(f'panel:{i}', state['label'][1], PANEL_LABEL_COLOR, **layout['labels'][i])
+
+    if batch:
+        screen.blits(batch, doreturn=False)
+    return dirty
+
+def draw_grid(seconds_value, snapshot):
+    stage_start = time.perf_counter()
+    effective_mode = get_effective_color_mode()
+    state = _render_state
+    radius = CELL_SIZE // 2 - min(10, CELL_SIZE // 6)
+
+    if state['order'] != BIT_ORDER or state['shape'] != LED_SHAPE:
+        state['full'] = True
+
+    dirty = []
+    if state['full']:
+        screen.fill(BG_COLOR)
+        if not panels:
+            for idx in range(LED_COUNT):
+                _draw_cell(idx, frame_colors[idx], radius)
+        state['settings'] = None
+        state['status'] = None
+    elif not panels:
+        # Cells whose on/off state flipped, found by XOR against the last value
+        cell_map = get_bit_cell_map()
+        changed = (seconds_value ^ state['value']) & LED_MASK
+        changed_cells = set()
+        while changed:
+            low = changed & -changed
+            changed_cells.add(cell_map[low.bit_length() - 1])
+            changed ^= low
+        # ...plus lit cells whose color moved on (animated modes, brightness)
+        previous_colors = state['colors']
+        for idx in range(LED_COUNT):
+            if idx in changed_cells or frame_colors[idx] != previous_colors[idx]:
+                dirty.append(_draw_cell(idx, frame_colors[idx], radius))
+
+    state['value'] = seconds_value
+    state['order'] = BIT_ORDER
+    state['shape'] = LED_SHAPE
+    state['colors'][:] = frame_colors
+    if panels:
+        dirty += draw_panels(snapshot, frame_time)
+
+    settings_text = None
+    if frame_time < settings_show_end:
+        settings_text = _settings_segments(effective_mode)
+    dirty += _draw_text_line('settings', settings_text, SETTINGS_TEXT_COLOR, top=10)
+
+    bottom_text = None
+    if SHOW_STATUS:
+        bottom_text = _status_segments(seconds_value, snapshot)
+    dirty += _draw_text_line('status', bottom_text, frame_text_color, bottom=HEIGHT - 10)
+    if _perf['enabled']:
+        dirty.append(_draw_perf_overlay())
+    perf_record('draw', stage_start)
+
+    stage_start = time.perf_counter()
+    if state['full']:
+        pygame.display.flip()
+        state['full'] = False
+    elif dirty:
+        pygame.display.update(dirty)
+    perf_record('present', stage_start)
+
+    stage_start = time.perf_counter()
+    update_physical_leds()
+    perf_record('publish', stage_start)
+
+# ===================================================================
+# Scheduling - the render loop sleeps until something can change
+# ===================================================================
+# Deadlines are: the next wall-clock second, the next keyframe of the active
+# mode, the settings overlay expiry and LED init retries. Key presses and
+# config reloads (posted as WAKE_EVENT by the watcher thread) end the sleep
+# early.
+
+WAKE_EVENT = None   # pygame custom event type, registered by init_display()
+
+def wake_render_loop():
+    """Interrupt the render loop's sleep; safe to call from any thread"""
+    if _headless['wake'] is not None:
+        try:
+            os.write(_headless['wake'][1], b'\0')
+        except OSError:
+            pass    # Pipe full: a wake-up is already pending
+    if WAKE_EVENT is None:
+        return
+    try:
+        pygame.event.post(pygame.event.Event(WAKE_EVENT))
+    except pygame.error:
+        pass
+
+def real_seconds_until(deadline: float) -> float:
+    """Real time until clock_now() reaches `deadline` (at most 1 s if the virtual clock is frozen)"""
+    remaining = deadline - clock_now()
+    if _virtual_clock['active']:
+        rate = _virtual_clock['rate']
+        return remaining / rate if rate > 0 else min(remaining, 1.0)
+    return remaining
+
+def wait_for_events(deadline: float):
+    """Sleep until `deadline` (clock_now() based) or the first event; returns pending events"""
+    remaining = real_seconds_until(deadline)
+    if remaining > 0.002:
+        # SDL waits with millisecond resolution; stop a little early and
+        # sleep the remainder so second flips land on the edge
+        event = pygame.event.wait(int(remaining * 1000) - 1)
+        if event.type != pygame.NOEVENT:
+            return [event] + pygame.event.get()
+        remaining = real_seconds_until(deadline)
+    if remaining > 0:
+        time.sleep(remaining)
+    return pygame.event.get()
+
+def next_color_mode(modes):
+    """The mode after COLOR_MODE in `modes`, or the first one if it is not in there"""
+    current = [m.lower() for m in modes]
+    if COLOR_MODE.lower() in current:
+        return modes[(current.index(COLOR_MODE.lower()) + 1) % len(modes)]
+    return modes[0]
+
+def settings_overlay_visible():
+    return _render_state['settings'] is not None
+
+def run_clock():
+    global COLOR_MODE, COUNT_DIRECTION, SHOW_STATUS, LED_SHAPE, BIT_ORDER, BRIGHTNESS
+    global settings_show_end, current_second, show_help
+
+    snapshot = get_time_snapshot()
+
+    need_redraw = True
+    deadline = clock_now()
+    animation_deadline = 0.0
+
+    while True:
+        events = wait_for_events(deadline)
+        stage_start = time.perf_counter()
+        for event in events:
+            if event.type == pygame.QUIT:
+                flush_config_saves()
+                return
+
+            if event.type == pygame.KEYDOWN:
+                if event.key in (pygame.K_ESCAPE, pygame.K_q):
+                    if show_help:
+                        show_help = False
+                        need_redraw = True
+                    else:
+                        flush_config_saves()
+                        return
+
+                if show_help:
+                    if event.key in (pygame.K_h, pygame.K_F1):
+                        show_help = False
+                        need_redraw = True
+                    continue
+
+                changed = False
+
+                if event.key == pygame.K_c:
+                    COLOR_MODE = next_color_mode(STANDARD_MODES)
+                    changed = True
+
+                elif event.key == pygame.K_f:
+                    COLOR_MODE = next_color_mode(FESTIVE_MODES)
+                    changed = True
+
+                elif event.key in (pygame.K_h, pygame.K_F1):
+                    show_help = True
+                    need_redraw = True
+                    continue
+
+                elif event.key == pygame.K_p:
+                    set_perf_overlay(not _perf['enabled'])
+                    need_redraw = True
+                    continue
+
+                elif event.key == pygame.K_d:
+                    COUNT_DIRECTION = 'up' if COUNT_DIRECTION == 'down' else 'down'
+                    changed = True
+                elif event.key == pygame.K_s:
+                    SHOW_STATUS = not SHOW_STATUS
+                    changed = True
+                elif event.key == pygame.K_l:
+                    idx = shape_modes.index(LED_SHAPE)
+                    LED_SHAPE = shape_modes[(idx + 1) % len(shape_modes)]
+                    changed = True
+                elif event.key == pygame.K_o:
+                    order_list = ['normal', 'reverse', 'transpose']
+                    idx = order_list.index(BIT_ORDER)
+                    BIT_ORDER = order_list[(idx + 1) % 3]
+                    changed = True
+                elif event.key in (pygame.K_PLUS, pygame.K_EQUALS):
+                    BRIGHTNESS = min(1.0, BRIGHTNESS + 0.1)
+                    changed = True
+                elif event.key == pygame.K_MINUS:
+                    BRIGHTNESS = max(0.2, BRIGHTNESS - 0.1)
+                    changed = True
+
+                if changed:
+                    schedule_config_save()
+                    settings_show_end = clock_now() + 8.0
+                    need_redraw = True
+
+        perf_record('events', stage_start)
+
+        stage_start = time.perf_counter()
+        if check_and_reload_config():
+            need_redraw = True
+        if apply_control_changes():
+            need_redraw = True
+        if need_redraw:
+            notify_settings_changed()
+        perf_record('config', stage_start)
+
+        if led_init_pending() and init_physical_leds():
+            need_redraw = True
+
+        current_time = clock_now()
+        if int(current_time) != current_second:
+            note_second_flip(int(current_time), current_second, current_time)
+            metrics_second_flip()
+            current_second = int(current_time)
+            snapshot = get_time_snapshot(current_time)
+            need_redraw = True
+
+        if not show_help:
+            if current_time >= animation_deadline:
+                need_redraw = True
+            if settings_overlay_visible() and current_time >= settings_show_end:
+                need_redraw = True
+
+        if need_redraw:
+            if show_help:
+                draw_help_screen()
+            else:
+                frame_start = stage_start = time.perf_counter()
+                value = get_matrix_value(snapshot, current_time)
+                compose_frame(value, current_time)
+                perf_record('compose', stage_start)
+                draw_grid(value, snapshot)
+                metrics_frame(time.perf_counter() - frame_start)
+                prepare_next_second(current_second + 1)
+            need_redraw = False
+
+        deadline = current_second + 1
+        if not show_help:
+            animation_deadline = next_animation_deadline(current_time)
+            deadline = min(deadline, animation_deadline)
+            if current_time < settings_show_end:
+                deadline = min(deadline, settings_show_end)
+        retry = next_led_init_retry()
+        if retry is not None:
+            deadline = min(deadline, current_time + retry)
+
+    flush_config_saves()
+
+def replay_journal(journal, speed: float = 1.0):
+    """Play an open FrameJournal back on the screen and the outputs; Esc/Q stops"""
+    global BRIGHTNESS, frame_time, frame_value, frame_text_color, frame_packed
+    global settings_show_end, current_second
+    print(f"Replaying {len(journal)} frames from {journal.path} at {speed:g}x")
+    settings_show_end = 0.0
+    saved_brightness = BRIGHTNESS
+    start = time.perf_counter()
+    first = None
+    try:
+        for record in journal.records():
+            if first is None:
+                first = record.time
+            deadline = start + (record.time - first) / speed if speed > 0 else start
+            while True:
+                for event in pygame.event.get():
+                    if event.type == pygame.QUIT or (
+                            event.type == pygame.KEYDOWN and event.key in (pygame.K_ESCAPE, pygame.K_q)):
+                        return
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                time.sleep(min(remaining, 0.05))
+
+            set_virtual_clock(record.time, 0.0)
+            current_second = int(record.time)
+            BRIGHTNESS = record.level
+            frame_colors[:] = [scale_color(((w >> 16) & 0xFF, (w >> 8) & 0xFF, w & 0xFF)) if w else None
+                               for w in record.pixels]
+            frame_packed = record.pixels
+            frame_time = record.time
+            frame_value = record.value
+            frame_text_color = get_status_text_color(record.time, frame_colors)
+            # draw_grid() also hands the frame to the outputs
+            draw_grid(record.value, get_time_snapshot(record.time))
+    finally:
+        BRIGHTNESS = saved_brightness
+        clear_virtual_clock()
+        journal.close()
+    print("Replay finished")
+
+# ===================================================================
+# Headless mode - LEDs only, without pygame
+# ===================================================================
+# --headless is for units without a screen, e.g. run as a systemd service.
+# pygame is never imported: the loop composes frames with the same color and
+# bit-mapping code as the screen and hands them to the outputs, then sleeps in
+# select() on a self-pipe until the next second, the next keyframe of an
+# animated mode, or a wake-up. The config watcher and the control socket wake
+# it through wake_render_loop(), and signals through signal.set_wakeup_fd():
+#
+#   SIGHUP          re-read the config file now
+#   SIGUSR1         next standard color mode (like C)
+#   SIGUSR2         next festive color mode (like F)
+#   SIGTERM/SIGINT  save pending settings and exit
+
+_headless = {
+    'wake': None,       # (read fd, write fd) of the self-pipe
+    'signals': [],      # Signal numbers waiting for the loop
+}
+
+def _headless_signal(signum, frame):
+    _headless['signals'].append(signum)
+
+def _install_headless_wakeup():
+    import signal
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    os.set_blocking(write_fd, False)
+    _headless['wake'] = (read_fd, write_fd)
+    signal.set_wakeup_fd(write_fd)
+    for signum in (signal.SIGHUP, signal.SIGUSR1, signal.SIGUSR2, signal.SIGTERM, signal.SIGINT):
+        signal.signal(signum, _headless_signal)
+
+def _headless_wait(deadline: float):
+    """Sleep until `deadline` (clock_now() based) or a wake-up"""
+    read_fd = _headless['wake'][0]
+    remaining = real_seconds_until(deadline)
+    if remaining > 0:
+        select.select([read_fd], [], [], remaining)
+    try:
+        while os.read(read_fd, 512):
+            pass
+    except BlockingIOError:
+        pass
+
+def request_config_reload():
+    """Re-read and apply the config file (SIGHUP), whether or not it changed"""
+    # Write out SIGUSR1/SIGUSR2 changes still waiting for the debounce first,
+    # so the reload doesn't silently undo them
+    flush_config_saves()
+    result = _read_config_file()
+    if result is None:
+        return False
+    with _config_lock:
+        _config_state['hash'] = result[0]
+        _config_state['pending_reload'] = None  # Superseded by this read
+    _reload_config(result[1], "SIGHUP received, reloading the config file...")
+    return True
+
+def run_headless():
+    global COLOR_MODE, current_second
+    import signal
+    _install_headless_wakeup()
+    snapshot = get_time_snapshot()
+    need_frame = True
+    deadline = clock_now()
+    animation_deadline = 0.0
+
+    while True:
+        _headless_wait(deadline)
+
+        stage_start = time.perf_counter()
+        signals = _headless['signals']
+        while signals:
+            signum = signals.pop(0)
+            if signum in (signal.SIGTERM, signal.SIGINT):
+                flush_config_saves()
+                return
+            if signum == signal.SIGHUP:
+                if request_config_reload():
+                    need_frame = True
+            elif signum in (signal.SIGUSR1, signal.SIGUSR2):
+                COLOR_MODE = next_color_mode(STANDARD_MODES if signum == signal.SIGUSR1 else FESTIVE_MODES)
+                schedule_config_save()
+                need_frame = True
+        perf_record('events', stage_start)
+
+        stage_start = time.perf_counter()
+        if check_and_reload_config():
+            need_frame = True
+        if apply_control_changes():
+            need_frame = True
+        if need_frame:
+            notify_settings_changed()
+        perf_record('config', stage_start)
+
+        if led_init_pending() and init_physical_leds():
+            need_frame = True
+
+        current_time = clock_now()
+        if int(current_time) != current_second:
+            note_second_flip(int(current_time), current_second, current_time)
+            metrics_second_flip()
+            current_second = int(current_time)
+            snapshot = get_time_snapshot(current_time)
+            need_frame = True
+        if current_time >= animation_deadline:
+            need_frame = True
+
+        if need_frame:
+            frame_start = stage_start = time.perf_counter()
+            compose_frame(get_matrix_value(snapshot, current_time), current_time)
+            perf_record('compose', stage_start)
+            stage_start = time.perf_counter()
+            update_physical_leds()
+            perf_record('publish', stage_start)
+            metrics_frame(time.perf_counter() - frame_start)
+            prepare_next_second(current_second + 1)
+            need_frame = False
+
+        animation_deadline = next_animation_deadline(current_time)
+        deadline = min(current_second + 1, animation_deadline)
+        retry = next_led_init_retry()
+        if retry is not None:
+            deadline = min(deadline, current_time + retry)
+
+# ===================================================================
+# Startup
+# ===================================================================
+
+def init_display(size=None, fullscreen=True):
+    global pygame, WAKE_EVENT
+    if pygame is None:
+        import pygame
+    pygame.display.init()
+    pygame.font.init()
+    if WAKE_EVENT is None:
+        WAKE_EVENT = pygame.event.custom_type()
+    if fullscreen:
+        surface = pygame.display.set_mode(size or (0, 0), pygame.FULLSCREEN)
+    else:
+        surface = pygame.display.set_mode(size or (800, 480))
+    pygame.mouse.set_visible(False)
+    pygame.display.set_caption("5x5 Binary Nerd Clock")
+    set_screen(surface)
+
+def startup(config_file=None, size=None, fullscreen=True, font_file=None, metrics=None, control=None,
+            headless=False, geometry=None):
+    """Bring up config, LEDs and display, in the order that lights the LEDs soonest"""
+    global CONFIG_FILE, FONT_FILE, settings_show_end, current_second
+    if config_file:
+        CONFIG_FILE = config_file
+    if font_file:
+        FONT_FILE = font_file
+
+    load_config()
+    if geometry is not None:
+        # A replayed journal's matrix, before the outputs are sized from it
+        set_matrix_geometry(*geometry)
+    now = clock_now()
+    settings_show_end = now + 8.0
+    current_second = int(now)
+    if headless:
+        # Window outputs can never open without a display
+        output_sinks[:] = [sink for sink in output_sinks if not sink.needs_display]
+
+    # Strips do not need the display; push the first frame before opening it
+    if init_physical_leds():
+        compose_frame(get_matrix_value(get_time_snapshot(now), now), now)
+        update_physical_leds()
+
+    if not headless:
+        init_display(size, fullscreen)
+        init_physical_leds()    # Window outputs
+    start_config_threads()
+    if metrics:
+        start_metrics_server(metrics)
+    if control:
+        start_control_server(control)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="5x5 Binary Nerd Clock")
+    parser.add_argument('--config', help=f"config file (default: {CONFIG_FILE})")
+    parser.add_argument('--font', help="TTF/OTF font file for the text lines")
+    parser.add_argument('--windowed', metavar='WIDTHxHEIGHT',
+                        help="run in a window of this size instead of fullscreen")
+    parser.add_argument('--metrics', metavar='PORT|HOST:PORT|SOCKET',
+                        help="serve Prometheus metrics at /metrics (a bare port binds to localhost)")
+    parser.add_argument('--control', metavar='SOCKET',
+                        help="Unix socket for the JSON settings API")
+    parser.add_argument('--time', metavar="'YYYY-MM-DD HH:MM:SS'",
+                        help="run from this local time instead of the real clock")
+    parser.add_argument('--time-rate', type=float, default=1.0, metavar='RATE',
+                        help="virtual seconds per real second (with --time)")
+    parser.add_argument('--headless', action='store_true',
+                        help="drive the LEDs only, without a screen or pygame")
+    parser.add_argument('--plugin', action='append', default=[], metavar='MODULE',
+                        help="load color modes from a module or .py file (repeatable)")
+    parser.add_argument('--journal', metavar='FILE',
+                        help="record every LED frame to this memory-mapped ring file")
+    parser.add_argument('--journal-size', type=float, default=JOURNAL_DEFAULT_SIZE / (1024 * 1024), metavar='MB',
+                        help="size of a new journal file")
+    parser.add_argument('--replay', metavar='FILE', help="play back a journal instead of running the clock")
+    parser.add_argument('--replay-speed', type=float, default=1.0, metavar='X',
+                        help="playback speed (0 plays as fast as possible)")
+    args = parser.parse_args(argv)
+    if args.headless and args.replay:
+        parser.error("--replay needs the screen")
+    # Before the config is read, so it can select the plugins' modes
+    for plugin in args.plugin:
+        load_plugin(plugin)
+
+    if args.time:
+        start = datetime.datetime.fromisoformat(args.time).timestamp()
+        set_virtual_clock(start, args.time_rate)
+
+    size = None
+    if args.windowed:
+        size = tuple(int(v) for v in args.windowed.lower().split('x'))
+
+    journal = None
+    if args.replay:
+        try:
+            journal = FrameJournal(args.replay, readonly=True)
+        except (OSError, ValueError) as e:
+            raise SystemExit(f"Cannot replay: {e}")
+
+    print("Classic 5x5 Binary Nerd Clock starting!")
+    print("\nCredits: Crafted in collaboration with Grok by xAI and the remarkable visionary Prophet6")
+    startup(args.config, size, fullscreen=size is None, font_file=args.font, metrics=args.metrics,
+            control=args.control, headless=args.headless,
+            geometry=(journal.rows, journal.cols) if journal is not None else None)
+    if args.headless:
+        if args.journal:
+            open_frame_journal(args.journal, int(args.journal_size * 1024 * 1024))
+        run_headless()
+        close_frame_journal()
+    elif args.replay:
+        replay_journal(journal, args.replay_speed)
+    else:
+        if args.journal:
+            open_frame_journal(args.journal, int(args.journal_size * 1024 * 1024))
+        run_clock()
+        close_frame_journal()
+    stop_outputs()
+    if pygame is not None:
+        pygame.quit()
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
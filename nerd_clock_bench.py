@@ -0,0 +1,271 @@
+"""
+Headless benchmark for the Nerd Clock render and LED pipelines.
+
+Runs under SDL's dummy video driver with a fake PixelStrip that records the
+calls it receives, sweeps every color mode and LED shape at several
+resolutions, and writes frames/sec, p50/p99 frame times and per-frame
+allocation figures to JSON so releases can be compared.
+
+    python3 nerd_clock_bench.py --frames 240 --output bench.json
+"""
+
+import argparse
+import configparser
+import datetime
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+import types
+
+# Must be set before pygame is imported by nerd_clock
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+DEFAULT_RESOLUTIONS = ['800x480', '1920x1080', '3840x2160']
+FRAME_RATE = 60
+
+# ===================================================================
+# Fake rpi_ws281x - records calls instead of driving GPIO
+# ===================================================================
+
+def Color(red, green, blue, white=0):
+    return (white << 24) | (red << 16) | (green << 8) | blue
+
+class FakePixelStrip:
+    def __init__(self, num, pin, freq_hz=800000, dma=10, invert=False,
+                 brightness=255, channel=0, strip_type=None, gamma=None):
+        self.num = num
+        self.pixels = [0] * num
+        self.brightness = brightness
+        self.calls = {'setPixelColor': 0, 'show': 0, 'setBrightness': 0, 'begin': 0}
+
+    def begin(self):
+        self.calls['begin'] += 1
+
+    def numPixels(self):
+        return self.num
+
+    def setPixelColor(self, n, color):
+        self.calls['setPixelColor'] += 1
+        self.pixels[n] = color
+
+    def setBrightness(self, brightness):
+        self.calls['setBrightness'] += 1
+        self.brightness = brightness
+
+    def getBrightness(self):
+        return self.brightness
+
+    def show(self):
+        self.calls['show'] += 1
+
+    def reset_calls(self):
+        for name in self.calls:
+            self.calls[name] = 0
+
+def install_fake_ws281x():
+    module = types.ModuleType('rpi_ws281x')
+    module.PixelStrip = FakePixelStrip
+    module.Color = Color
+    sys.modules['rpi_ws281x'] = module
+    return module
+
+install_fake_ws281x()
+
+import pygame
+import nerd_clock as nc
+
+# ===================================================================
+# Measurement
+# ===================================================================
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    k = (len(ordered) - 1) * pct / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+def summarize(frame_times, alloc_peaks, net_blocks):
+    total = sum(frame_times)
+    return {
+        'frames': len(frame_times),
+        'fps': len(frame_times) / total if total else 0.0,
+        'mean_ms': statistics.fmean(frame_times) * 1000.0,
+        'p50_ms': percentile(frame_times, 50) * 1000.0,
+        'p99_ms': percentile(frame_times, 99) * 1000.0,
+        'max_ms': max(frame_times) * 1000.0,
+        'alloc_peak_bytes_per_frame': statistics.fmean(alloc_peaks) if alloc_peaks else None,
+        'net_blocks_per_frame': statistics.fmean(net_blocks) if net_blocks else None,
+    }
+
+def measure(step, frames, warmup, track_allocations):
+    """Time `step(i)` per frame; a second pass samples allocations under tracemalloc"""
+    for i in range(warmup):
+        step(i)
+
+    frame_times = []
+    for i in range(frames):
+        start = time.perf_counter()
+        step(warmup + i)
+        frame_times.append(time.perf_counter() - start)
+
+    alloc_peaks = []
+    net_blocks = []
+    if track_allocations:
+        tracemalloc.start()
+        for i in range(frames):
+            current, _ = tracemalloc.get_traced_memory()
+            tracemalloc.reset_peak()
+            blocks = sys.getallocatedblocks()
+            step(warmup + frames + i)
+            net_blocks.append(sys.getallocatedblocks() - blocks)
+            alloc_peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        tracemalloc.stop()
+
+    return summarize(frame_times, alloc_peaks, net_blocks)
+
+# ===================================================================
+# Pipeline stages
+# ===================================================================
+
+BASE_TIME = datetime.datetime(2026, 6, 15, 12, 0, 0).timestamp()
+
+def frame_clock(i):
+    """Synthetic frame time and counter value; the counter ticks every FRAME_RATE frames"""
+    t = BASE_TIME + i / FRAME_RATE
+    nc.current_second = int(t)
+    return t, (20_000_000 - i // FRAME_RATE) & nc.LED_MASK
+
+def bench_frame(i):
+    t, value = frame_clock(i)
+    nc.compose_frame(value, t)
+    nc.draw_grid(value, nc.get_time_snapshot(t))
+    nc.flush_outputs()
+
+def bench_cell_colors(i):
+    t, value = frame_clock(i)
+    nc.get_cell_colors(nc.get_color_mode(), t)
+
+def bench_physical_leds(i):
+    t, value = frame_clock(i)
+    nc.compose_frame(value, t)
+    nc.update_physical_leds()
+    # Include the strip write the output thread would do
+    nc.flush_outputs()
+
+def bench_help_screen(i):
+    nc.draw_help_screen()
+
+def configure(mode, shape):
+    nc.COLOR_MODE = mode
+    nc.LED_SHAPE = shape
+    nc.settings_show_end = 0.0
+    nc.invalidate_grid()
+
+def configure_panels(count):
+    """`count` screen panels cycling through the panel sources"""
+    config = configparser.ConfigParser(interpolation=None)
+    for i in range(count):
+        config[f'panel:bench{i}'] = {'source': nc.PANEL_SOURCES[i % len(nc.PANEL_SOURCES)]}
+    nc.configure_panels(config)
+
+def run_benchmarks(resolutions, modes, shapes, frames, warmup, track_allocations):
+    results = []
+    # Written synchronously by flush_outputs(); no writer thread is started
+    sink = nc.StripSink('strip')
+    sink.try_open()
+    nc.output_sinks[:] = [sink]
+
+    for resolution in resolutions:
+        width, height = (int(v) for v in resolution.lower().split('x'))
+        nc.init_display((width, height), fullscreen=False)
+
+        configure(nc.STANDARD_MODES[0], nc.shape_modes[0])
+        stats = measure(bench_help_screen, frames, warmup, track_allocations)
+        results.append(dict(stage='draw_help_screen', resolution=resolution, **stats))
+        print(f"{resolution:>10} {'help':>12} {'-':>8} {stats['fps']:9.1f} fps")
+
+        for mode in modes:
+            configure(mode, nc.shape_modes[0])
+            if resolution == resolutions[0]:
+                # Color evaluation and strip output do not depend on the resolution
+                for stage, step in (('cell_colors', bench_cell_colors),
+                                    ('update_physical_leds', bench_physical_leds)):
+                    sink.strip.reset_calls()
+                    stats = measure(step, frames, warmup, track_allocations)
+                    entry = dict(stage=stage, mode=mode, **stats)
+                    if stage == 'update_physical_leds':
+                        steps = warmup + frames * (2 if track_allocations else 1)
+                        entry['strip_calls_per_frame'] = {
+                            name: count / steps for name, count in sink.strip.calls.items()}
+                    results.append(entry)
+
+            for shape in shapes:
+                configure(mode, shape)
+                stats = measure(bench_frame, frames, warmup, track_allocations)
+                engine = 'numpy' if nc.use_vector_engine(nc.get_color_mode()) else 'python'
+                results.append(dict(stage='frame', resolution=resolution, mode=mode,
+                                    shape=shape, engine=engine, **stats))
+                print(f"{resolution:>10} {mode:>12} {shape:>8} {stats['fps']:9.1f} fps  "
+                      f"p50 {stats['p50_ms']:6.2f} ms  p99 {stats['p99_ms']:6.2f} ms")
+
+    return results
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the Nerd Clock render and LED pipelines")
+    parser.add_argument('--frames', type=int, default=120, help="measured frames per configuration")
+    parser.add_argument('--warmup', type=int, default=30, help="unmeasured frames before each run")
+    parser.add_argument('--resolutions', default=','.join(DEFAULT_RESOLUTIONS),
+                        help="comma-separated WIDTHxHEIGHT list")
+    parser.add_argument('--modes', help="comma-separated color modes (default: all)")
+    parser.add_argument('--shapes', help="comma-separated LED shapes (default: all)")
+    parser.add_argument('--matrix', default='5x5', metavar='ROWSxCOLS', help="LED matrix size")
+    parser.add_argument('--engine', choices=nc.COLOR_ENGINES, default='auto',
+                        help="color engine (see [matrix] engine in the config)")
+    parser.add_argument('--panels', type=int, default=0, help="screen panels to draw (see [panel:NAME])")
+    parser.add_argument('--no-allocations', action='store_true',
+                        help="skip the tracemalloc pass")
+    parser.add_argument('--output', default='bench_results.json', help="JSON results file")
+    args = parser.parse_args(argv)
+
+    modes = args.modes.split(',') if args.modes else nc.STANDARD_MODES + nc.FESTIVE_MODES
+    shapes = args.shapes.split(',') if args.shapes else list(nc.shape_modes)
+    resolutions = args.resolutions.split(',')
+    rows, cols = (int(v) for v in args.matrix.lower().split('x'))
+    nc.set_matrix_geometry(rows, cols)
+    nc.COLOR_ENGINE = args.engine
+    configure_panels(args.panels)
+
+    results = run_benchmarks(resolutions, modes, shapes, args.frames, args.warmup,
+                             not args.no_allocations)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'sdl': '.'.join(str(v) for v in pygame.get_sdl_version()),
+            'machine': platform.machine(),
+            'platform': platform.platform(),
+            'video_driver': pygame.display.get_driver(),
+            'frames': args.frames,
+            'matrix': args.matrix,
+            'panels': args.panels,
+            'engine': args.engine,
+            'warmup': args.warmup,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+LED driver process for the Nerd Clock.
+
+rpi_ws281x needs root for DMA. To keep the clock's UI, keyboard handling and
+config writes unprivileged, publish the strip's frames on the shared-memory
+frame bus instead of driving it from the clock:
+
+    [output:strip]
+    type = shm
+    pin = 21
+
+and drive the strip from the bus in this small process, as root:
+
+    sudo python3 nerd_clock_driver.py --output strip
+
+The strip settings (pin, channel, dma, rgbw, gamma, brightness, max_fps) come
+from the same [output:NAME] section of the clock's config file. The driver
+never imports pygame. It waits for the clock to start, keeps showing the last
+frame while the clock restarts and follows a new segment when one appears.
+"""
+
+import argparse
+import configparser
+import signal
+import sys
+import time
+
+import nerd_clock as nc
+
+POLL_INTERVAL = 0.004   # Seconds between frame bus checks
+STALE_AFTER = 2.0       # Seconds without frames before checking for a new segment
+ATTACH_RETRY = 1.0      # Seconds between looks for the clock's segment
+
+def build_sink(config, name, kind):
+    section = dict(config[f'output:{name}']) if config.has_section(f'output:{name}') else {}
+    section['type'] = kind
+    sink = nc.build_output(name, section)
+    if sink is None or sink.kind == nc.SharedFrameSink.kind:
+        raise SystemExit(f"Cannot drive output '{name}' as type '{kind}'")
+    return sink
+
+def attach(segment):
+    """Wait for the clock to create the segment"""
+    waiting = False
+    while True:
+        try:
+            return nc.FrameBusReader(segment)
+        except (FileNotFoundError, ValueError):
+            if not waiting:
+                print(f"Waiting for the clock to publish '{segment}'")
+                waiting = True
+            time.sleep(ATTACH_RETRY)
+
+def run(config, name, kind, segment, poll):
+    reader = None
+    sink = None
+    last_frame = time.monotonic()
+    while True:
+        if reader is None:
+            reader = attach(segment)
+            if sink is None or (reader.rows, reader.cols) != (nc.MATRIX_ROWS, nc.MATRIX_COLS):
+                if sink is not None:
+                    sink.stop()
+                nc.set_matrix_geometry(reader.rows, reader.cols)
+                sink = build_sink(config, name, kind)
+                nc.output_sinks[:] = [sink]
+            print(f"Following '{segment}' ({reader.rows}x{reader.cols})")
+
+        if not sink.ready:
+            if sink.try_open():
+                sink.start()
+            elif sink.gave_up:
+                return 1
+            else:
+                time.sleep(nc.LED_INIT_RETRY_MIN)
+                continue
+
+        frame = reader.read()
+        now = time.monotonic()
+        if frame is not None:
+            sink.post(frame.pixels, frame.level, frame.time)
+            last_frame = now
+        elif now - last_frame > STALE_AFTER:
+            last_frame = now
+            if reader.replaced():
+                reader.close()
+                reader = None
+                continue
+        time.sleep(poll)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive Nerd Clock LEDs from the shared-memory frame bus")
+    parser.add_argument('--config', default=nc.CONFIG_FILE, help=f"clock config file (default: {nc.CONFIG_FILE})")
+    parser.add_argument('--output', default='strip', metavar='NAME', help="[output:NAME] section to drive")
+    parser.add_argument('--type', default='ws281x', choices=[k for k in nc.OUTPUT_TYPES if k != 'shm'],
+                        help="output type to drive the frames with")
+    parser.add_argument('--segment', help="shared memory name (default: the section's segment, or nerd_clock_NAME)")
+    parser.add_argument('--poll', type=float, default=POLL_INTERVAL, metavar='SECONDS',
+                        help="interval between frame bus checks")
+    args = parser.parse_args(argv)
+
+    config = configparser.ConfigParser(interpolation=None)
+    config.read(args.config)
+    segment = args.segment or config.get(f'output:{args.output}', 'segment', fallback=None) \
+        or f'nerd_clock_{args.output}'
+
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        return run(config, args.output, args.type, segment, args.poll)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        nc.stop_outputs()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Soak test for the Nerd Clock.
+
+Runs the real render loop (run_clock) under SDL's dummy video driver, with a
+fake PixelStrip, for days or weeks of frames. Instead of sleeping, the loop
+steps a frozen virtual clock to the time of its next frame, so every second
+and every animation keyframe of the simulated weeks is rendered, as fast as
+the machine allows. A sampler thread records traced Python memory
+(tracemalloc), RSS and the number of live pygame Surfaces. The hot
+functions of the loop are wrapped with per-call allocation counters.
+
+    python3 nerd_clock_soak.py --days 14 --output soak.json
+
+The test fails (exit status 1) if traced memory, RSS or the surface count
+grows by more than its limit between the end of the warm-up and the end of
+the run. The per-function figures show whether the loop settles into a
+steady state: transient bytes per call should stay flat, and net blocks per
+call should stay constant. A function that hands its result on (a new time
+snapshot, the composed frame) shows it as positive blocks, and its consumer
+shows it as negative blocks when it replaces the previous one.
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+# Must be set before pygame is imported by nerd_clock
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+from nerd_clock_bench import install_fake_ws281x
+
+install_fake_ws281x()
+
+import pygame
+import nerd_clock as nc
+
+# Called once per frame (or per config check) from run_clock and never from
+# each other, so their tracemalloc peaks don't overlap
+HOT_FUNCTIONS = ('check_and_reload_config', 'apply_control_changes', 'get_time_snapshot',
+                 'get_matrix_value', 'compose_frame', 'draw_grid', 'prepare_next_second')
+WARMUP_FRACTION = 0.1   # Share of the run before the baseline sample
+TOP_GROWTH = 10         # Source lines listed in the report by memory growth
+
+# ===================================================================
+# Measurement
+# ===================================================================
+
+hot_stats = {}
+_wrapper_overhead = {'bytes': 0.0, 'blocks': 0.0}
+
+def count_allocations(name):
+    """Replace nc.<name> with a wrapper that counts transient bytes and net blocks per call"""
+    func = getattr(nc, name)
+    stats = hot_stats[name] = {'calls': 0, 'bytes': 0, 'blocks': 0}
+
+    def wrapper(*args, **kwargs):
+        start, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        blocks = sys.getallocatedblocks()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            stats['blocks'] += sys.getallocatedblocks() - blocks
+            stats['bytes'] += tracemalloc.get_traced_memory()[1] - start
+            stats['calls'] += 1
+
+    setattr(nc, name, wrapper)
+    return wrapper
+
+def calibrate(calls=1000):
+    """What the counting wrapper itself shows per call, subtracted from the report"""
+    nc._soak_noop = lambda: None
+    wrapper = count_allocations('_soak_noop')
+    for _ in range(calls):
+        wrapper()
+    stats = hot_stats.pop('_soak_noop')
+    del nc._soak_noop
+    _wrapper_overhead['bytes'] = stats['bytes'] / calls
+    _wrapper_overhead['blocks'] = stats['blocks'] / calls
+
+def stepped_clock(end_time):
+    """Stand-in for nc.wait_for_events: jump to the loop's next frame instead of sleeping; QUIT at `end_time`"""
+    def wait_for_events(deadline):
+        if deadline >= end_time:
+            return [pygame.event.Event(pygame.QUIT)]
+        if deadline > nc.clock_now():
+            nc.set_virtual_clock(deadline, 0.0)
+        return pygame.event.get()
+    nc.wait_for_events = wait_for_events
+
+def traced_snapshot():
+    """tracemalloc snapshot without this harness's own allocations (its sample history)"""
+    # A full collection also empties CPython's tuple/float free lists, whose
+    # parked blocks tracemalloc would otherwise report as growth
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces([
+        tracemalloc.Filter(False, __file__),
+        tracemalloc.Filter(False, tracemalloc.__file__),
+    ])
+
+def rss_bytes():
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+def count_surfaces():
+    """Live Surfaces referenced from any container (Surfaces themselves are not GC-tracked)"""
+    seen = set()
+    for obj in gc.get_objects():
+        for ref in gc.get_referents(obj):
+            if isinstance(ref, pygame.Surface):
+                seen.add(id(ref))
+    return len(seen)
+
+def take_sample(wall_start, snapshot):
+    sample = {
+        'wall_seconds': time.perf_counter() - wall_start,
+        'virtual_time': nc.clock_now(),
+        'frames': nc._metrics['frames'],
+        'traced_bytes': sum(stat.size for stat in snapshot.statistics('filename')),
+        'rss_bytes': rss_bytes(),
+        'surfaces': count_surfaces(),
+        'hot': {},
+    }
+    # Per-call figures for the window since the previous sample
+    for name, stats in hot_stats.items():
+        calls, total_bytes, blocks = stats['calls'], stats['bytes'], stats['blocks']
+        last = stats.get('last', (0, 0, 0))
+        window_calls = calls - last[0]
+        if window_calls:
+            sample['hot'][name] = {
+                'calls': window_calls,
+                'bytes_per_call': max(0.0, (total_bytes - last[1]) / window_calls - _wrapper_overhead['bytes']),
+                'blocks_per_call': (blocks - last[2]) / window_calls - _wrapper_overhead['blocks'],
+            }
+        stats['last'] = (calls, total_bytes, blocks)
+    return sample
+
+def sampler(samples, snapshots, warmup_end, interval, wall_start, done):
+    """Sample every `interval` real seconds until the render loop has finished"""
+    while not done.wait(interval):
+        snapshot = traced_snapshot()
+        sample = take_sample(wall_start, snapshot)
+        samples.append(sample)
+        if 'baseline' not in snapshots and sample['virtual_time'] >= warmup_end:
+            snapshots['baseline'] = (len(samples) - 1, snapshot)
+        day = datetime.datetime.fromtimestamp(sample['virtual_time']).strftime('%Y-%m-%d %H:%M')
+        print(f"{day}  {sample['frames']:>9} frames  traced {sample['traced_bytes'] / 1024:8.0f} KiB  "
+              f"rss {sample['rss_bytes'] / 1048576:6.1f} MiB  surfaces {sample['surfaces']}")
+
+# ===================================================================
+# Verdict
+# ===================================================================
+
+def growth(samples, key, start):
+    """Median of the last three samples minus the median of the three from `start` (end of warm-up)"""
+    baseline = samples[start:start + 3]
+    final = samples[-3:]
+    return statistics.median(s[key] for s in final) - statistics.median(s[key] for s in baseline)
+
+def steady_state(samples):
+    """Per-call figures of the hot functions over the second half of the run"""
+    half = samples[len(samples) // 2:]
+    summary = {}
+    for name in HOT_FUNCTIONS:
+        windows = [s['hot'][name] for s in half[1:] if name in s['hot']]
+        calls = sum(w['calls'] for w in windows)
+        if calls:
+            summary[name] = {
+                'calls': calls,
+                'bytes_per_call': sum(w['bytes_per_call'] * w['calls'] for w in windows) / calls,
+                'blocks_per_call': sum(w['blocks_per_call'] * w['calls'] for w in windows) / calls,
+            }
+    return summary
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the Nerd Clock render loop for simulated weeks and check for leaks")
+    parser.add_argument('--start', default='2026-11-20', help="local start time of the virtual clock")
+    parser.add_argument('--days', type=float, default=7.0, help="simulated days to run")
+    parser.add_argument('--mode', default='automatic', help="color mode")
+    parser.add_argument('--size', default='800x480', metavar='WIDTHxHEIGHT', help="offscreen render size")
+    parser.add_argument('--interval', type=float, default=5.0, help="real seconds between samples")
+    parser.add_argument('--max-traced-kib', type=float, default=256, help="allowed traced memory growth")
+    parser.add_argument('--max-rss-kib', type=float, default=8192, help="allowed RSS growth")
+    parser.add_argument('--max-surfaces', type=int, default=64, help="allowed growth in live Surfaces")
+    parser.add_argument('--output', help="write samples and the verdict as JSON")
+    args = parser.parse_args(argv)
+
+    start = datetime.datetime.fromisoformat(args.start).timestamp()
+    end = start + args.days * 86400
+    config_file = os.path.join(tempfile.mkdtemp(prefix='nerd_clock_soak_'), 'clock_config.ini')
+
+    tracemalloc.start()
+    nc.set_virtual_clock(start, 0.0)
+    nc.startup(config_file, tuple(int(v) for v in args.size.lower().split('x')), fullscreen=False)
+    nc.COLOR_MODE = args.mode
+    stepped_clock(end)
+    for name in HOT_FUNCTIONS:
+        count_allocations(name)
+
+    calibrate()
+    samples = []
+    snapshots = {}
+    done = threading.Event()
+    wall_start = time.perf_counter()
+    warmup_end = start + (end - start) * WARMUP_FRACTION
+    thread = threading.Thread(target=sampler,
+                              args=(samples, snapshots, warmup_end, args.interval, wall_start, done),
+                              name='soak-sampler', daemon=True)
+    thread.start()
+    print(f"Soaking {args.days:g} simulated days, one frame per second or keyframe")
+    nc.run_clock()
+    done.set()
+    thread.join()
+    nc.stop_outputs()
+    final = traced_snapshot()
+    samples.append(take_sample(wall_start, final))
+    tracemalloc.stop()
+
+    baseline_index, baseline = snapshots.get('baseline', (None, None))
+    if baseline is None or len(samples) - baseline_index < 4:
+        print("Too few samples after the warm-up for a verdict; run longer or sample more often")
+        return 2
+    limits = {'traced_bytes': args.max_traced_kib * 1024, 'rss_bytes': args.max_rss_kib * 1024,
+              'surfaces': args.max_surfaces}
+    growths = {key: growth(samples, key, baseline_index) for key in limits}
+    top_growth = [{'line': str(stat.traceback), 'size_diff': stat.size_diff, 'count_diff': stat.count_diff}
+                  for stat in final.compare_to(baseline, 'lineno')[:TOP_GROWTH] if stat.size_diff > 0]
+    failures = [key for key, limit in limits.items() if growths[key] > limit]
+    steady = steady_state(samples)
+
+    wall = samples[-1]['wall_seconds']
+    print(f"{samples[-1]['frames']} frames in {wall:.0f} s ({samples[-1]['frames'] / wall:.0f} frames/s), "
+          f"{nc._perf['missed_flips']} seconds skipped")
+    print(f"Growth after warm-up: traced {growths['traced_bytes'] / 1024:+.0f} KiB, "
+          f"RSS {growths['rss_bytes'] / 1024:+.0f} KiB, surfaces {growths['surfaces']:+.0f}")
+    for entry in top_growth[:5]:
+        print(f"  {entry['size_diff']:+8d} B  {entry['count_diff']:+5d} blocks  {entry['line']}")
+    print("Steady state per call:")
+    for name, stats in steady.items():
+        print(f"  {name:<24} {stats['bytes_per_call']:9.0f} transient bytes  "
+              f"{stats['blocks_per_call']:+7.2f} net blocks")
+    print("FAIL: " + ", ".join(failures) + " grew" if failures else "PASS")
+
+    if args.output:
+        report = {
+            'meta': {'start': args.start, 'days': args.days, 'mode': args.mode,
+                     'size': args.size, 'matrix': f'{nc.MATRIX_ROWS}x{nc.MATRIX_COLS}',
+                     'python': sys.version.split()[0], 'pygame': pygame.version.ver},
+            'missed_seconds': nc._perf['missed_flips'],
+            'growth': growths, 'limits': limits, 'failures': failures,
+            'steady_state': steady, 'top_growth': top_growth, 'samples': samples,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
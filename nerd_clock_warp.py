@@ -0,0 +1,191 @@
+"""
+Time-warp simulator for the Nerd Clock.
+
+Drives the real compose/draw pipeline from a virtual clock over any date
+range, as fast as the machine allows, under SDL's dummy video driver. Use it
+to check the countdown, year rollover and `automatic` mode's seasonal themes
+without waiting for the dates:
+
+    python3 nerd_clock_warp.py --start 2026-01-01 --end 2027-01-01 --step 60
+    python3 nerd_clock_warp.py --start 2026-01-01 --end 2028-01-01 --transitions --snapshots shots/
+
+--transitions only renders a few seconds around each seasonal transition
+and year rollover. Mode changes, counter errors and throughput are printed
+and optionally written to JSON.
+"""
+
+import argparse
+import calendar
+import datetime
+import json
+import os
+import sys
+import time
+
+# Must be set before pygame is imported by nerd_clock
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+import nerd_clock as nc
+
+TRANSITION_WINDOW = 3   # Seconds rendered on each side of a transition
+
+# ===================================================================
+# Sample times
+# ===================================================================
+
+def parse_time(text):
+    return datetime.datetime.fromisoformat(text).timestamp()
+
+def every_step(start, end, step):
+    t = start
+    while t < end:
+        yield t
+        t += step
+
+def transition_times(start, end):
+    """Seconds around every seasonal transition and local New Year in [start, end)"""
+    edges = set()
+    day = datetime.date.fromtimestamp(start)
+    while True:
+        edge = nc.next_seasonal_transition(day)
+        if edge.timestamp() >= end:
+            break
+        edges.add(edge.timestamp())
+        day = edge.date()
+    for year in range(datetime.date.fromtimestamp(start).year + 1, datetime.date.fromtimestamp(end).year + 1):
+        edges.add(datetime.datetime(year, 1, 1).timestamp())
+
+    times = set()
+    for edge in edges:
+        for offset in range(-TRANSITION_WINDOW, TRANSITION_WINDOW):
+            if start <= edge + offset < end:
+                times.add(edge + offset)
+    return sorted(times)
+
+# ===================================================================
+# Simulation
+# ===================================================================
+
+def check_counter(snapshot, previous):
+    """Problems with the counters of this second, given the previous sampled snapshot"""
+    problems = []
+    year = snapshot.local.tm_year
+    year_length = 366 * 86400 if calendar.isleap(year) else 365 * 86400
+    if snapshot.elapsed + snapshot.remaining + 1 != year_length:
+        problems.append(f"elapsed {snapshot.elapsed} + remaining {snapshot.remaining} + 1 != {year_length}")
+    if previous is not None and snapshot.second == previous.second + 1:
+        if snapshot.local.tm_year != previous.local.tm_year:
+            if snapshot.elapsed != 0 or previous.remaining != 0:
+                problems.append(f"rollover went {previous.remaining} -> {snapshot.elapsed} elapsed")
+        elif snapshot.local.tm_gmtoff == previous.local.tm_gmtoff and snapshot.remaining != previous.remaining - 1:
+            problems.append(f"remaining jumped {previous.remaining} -> {snapshot.remaining}")
+    return problems
+
+def simulate(times, snapshot_dir=None, draw=True):
+    """Render every time of the iterable `times`, which may be a generator"""
+    events = []
+    problems = []
+    frames = 0
+    first = last = None
+    last_mode = None
+    previous = None
+
+    wall_start = time.perf_counter()
+    for t in times:
+        if first is None:
+            first = t
+        last = t
+        nc.set_virtual_clock(t, 0.0)
+        nc.current_second = int(t)
+        snapshot = nc.get_time_snapshot(t)
+        value = nc.get_matrix_value(snapshot, t)
+        nc.compose_frame(value, t)
+        if draw:
+            nc.draw_grid(value, snapshot)
+        frames += 1
+
+        for problem in check_counter(snapshot, previous):
+            problems.append({'time': time.strftime('%Y-%m-%d %H:%M:%S', snapshot.local), 'problem': problem})
+        mode = nc.get_effective_color_mode()
+        new_year = previous is not None and snapshot.local.tm_year != previous.local.tm_year
+        if mode != last_mode or new_year:
+            stamp = time.strftime('%Y-%m-%d %H:%M:%S', snapshot.local)
+            events.append({'time': stamp, 'mode': mode, 'value': value, 'new_year': new_year})
+            print(f"{stamp}  {mode:<12} value {value}" + ("  (new year)" if new_year else ""))
+            if snapshot_dir and draw:
+                name = f"{stamp.replace(' ', '_').replace(':', '')}_{mode}.png"
+                pygame.image.save(nc.screen, os.path.join(snapshot_dir, name))
+            last_mode = mode
+        previous = snapshot
+        if draw and frames % 10000 == 0:
+            pygame.event.pump()
+    elapsed = time.perf_counter() - wall_start
+
+    nc.clear_virtual_clock()
+    simulated = (last - first) if frames > 1 else 0.0
+    return {
+        'frames': frames,
+        'wall_seconds': elapsed,
+        'frames_per_second': frames / elapsed if elapsed else 0.0,
+        'simulated_seconds': simulated,
+        'speedup': simulated / elapsed if elapsed else 0.0,
+        'events': events,
+        'problems': problems,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Render the Nerd Clock over a date range as fast as possible")
+    parser.add_argument('--start', required=True, help="local start time, e.g. 2026-01-01 or '2026-12-31 23:59:00'")
+    parser.add_argument('--end', required=True, help="local end time (exclusive)")
+    parser.add_argument('--step', type=float, default=1.0, help="simulated seconds between frames")
+    parser.add_argument('--transitions', action='store_true',
+                        help="only render around seasonal transitions and New Year")
+    parser.add_argument('--mode', default='automatic', help="color mode to simulate")
+    parser.add_argument('--direction', choices=['down', 'up'], default='down')
+    parser.add_argument('--matrix', default='5x5', metavar='ROWSxCOLS', help="LED matrix size")
+    parser.add_argument('--size', default='800x480', metavar='WIDTHxHEIGHT', help="offscreen render size")
+    parser.add_argument('--no-draw', action='store_true', help="compose frames but skip drawing")
+    parser.add_argument('--snapshots', metavar='DIR', help="save a PNG at every mode change and New Year")
+    parser.add_argument('--output', help="write the report as JSON")
+    args = parser.parse_args(argv)
+
+    start, end = parse_time(args.start), parse_time(args.end)
+    if end <= start:
+        parser.error("--end must be after --start")
+    rows, cols = (int(v) for v in args.matrix.lower().split('x'))
+    nc.set_matrix_geometry(rows, cols)
+    nc.COLOR_MODE = args.mode
+    nc.COUNT_DIRECTION = args.direction
+    nc.settings_show_end = 0.0
+    if not args.no_draw:
+        nc.init_display(tuple(int(v) for v in args.size.lower().split('x')), fullscreen=False)
+    if args.snapshots:
+        os.makedirs(args.snapshots, exist_ok=True)
+
+    times = transition_times(start, end) if args.transitions else every_step(start, end, args.step)
+    report = simulate(times, args.snapshots, draw=not args.no_draw)
+    if not report['frames']:
+        print("Nothing to render in that range")
+        return 1
+
+    print(f"{report['frames']} frames in {report['wall_seconds']:.1f} s "
+          f"({report['frames_per_second']:.0f} frames/s, {report['speedup']:.0f}x real time)")
+    print(f"{len(report['problems'])} counter problems")
+    for problem in report['problems'][:20]:
+        print(f"  {problem['time']}: {problem['problem']}")
+
+    if args.output:
+        report['meta'] = {
+            'start': args.start, 'end': args.end, 'step': args.step, 'transitions': args.transitions,
+            'mode': args.mode, 'direction': args.direction, 'matrix': args.matrix,
+            'timezone': time.tzname[0], 'python': sys.version.split()[0],
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote report to {args.output}")
+    return 1 if report['problems'] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
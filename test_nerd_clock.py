@@ -0,0 +1,202 @@
+import datetime
+import os
+import stat
+
+import pytest
+
+import nerd_clock as nc
+
+def test_panel_label_with_percent_round_trips(tmp_path, monkeypatch):
+    config_file = tmp_path / 'clock_config.ini'
+    config_file.write_text("[panel:progress]\nsource = elapsed\nlabel = 50% done\n")
+    monkeypatch.setattr(nc, 'CONFIG_FILE', os.fspath(config_file))
+    monkeypatch.setattr(nc, '_panel_sections', {})
+    monkeypatch.setattr(nc, 'panels', [])
+
+    _, config = nc._read_config_file()
+    nc.configure_panels(config)
+    assert nc.panels[0].label == '50% done'
+
+    text = nc._serialize_config()
+    config_file.write_text(text)
+    _, config = nc._read_config_file()
+    assert config['panel:progress']['label'] == '50% done'
+
+def test_output_section_with_percent_round_trips(tmp_path, monkeypatch):
+    config_file = tmp_path / 'clock_config.ini'
+    config_file.write_text("[output:strip]\ntype = none\n\n[output:panel]\ntype = udp\nhost = led%1\n")
+    monkeypatch.setattr(nc, 'CONFIG_FILE', os.fspath(config_file))
+    monkeypatch.setattr(nc, '_output_sections', {})
+    monkeypatch.setattr(nc, 'output_sinks', [])
+
+    _, config = nc._read_config_file()
+    nc.configure_outputs(config)
+    assert nc.output_sinks[0].address[0] == 'led%1'
+
+    config_file.write_text(nc._serialize_config())
+    _, config = nc._read_config_file()
+    assert config['output:panel']['host'] == 'led%1'
+
+def test_config_save_keeps_mode_and_symlink(tmp_path, monkeypatch):
+    target = tmp_path / 'clock_config.ini'
+    target.write_text("[general_settings]\ncolor_mode = white\n")
+    os.chmod(target, 0o664)
+    link = tmp_path / 'link.ini'
+    link.symlink_to(target)
+    monkeypatch.setattr(nc, 'CONFIG_FILE', os.fspath(link))
+
+    nc.save_config()
+    assert link.is_symlink()
+    assert stat.S_IMODE(target.stat().st_mode) == 0o664
+    assert 'color_mode' in target.read_text()
+
+@pytest.mark.skipif(not hasattr(os, 'geteuid') or os.geteuid() != 0, reason="needs root to chown")
+def test_config_save_as_root_keeps_owner(tmp_path, monkeypatch):
+    config_file = tmp_path / 'clock_config.ini'
+    config_file.write_text("[general_settings]\ncolor_mode = white\n")
+    os.chown(config_file, 1000, 1000)
+    monkeypatch.setattr(nc, 'CONFIG_FILE', os.fspath(config_file))
+
+    nc.save_config()
+    st = config_file.stat()
+    assert (st.st_uid, st.st_gid) == (1000, 1000)
+
+class RecordingSink(nc.OutputSink):
+    threaded = False
+
+    def __init__(self, name, **options):
+        super().__init__(name, **options)
+        self.written = []
+
+    def write(self, pixels, level, previous):
+        self.written.append(pixels)
+
+def test_unthreaded_sink_keeps_to_max_fps(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(nc.time, 'monotonic', lambda: now[0])
+    sink = RecordingSink('test', max_fps=10)
+    sink.ready = True
+
+    sink.post((1,), 1.0)
+    sink.flush()
+    sink.post((2,), 1.0)
+    sink.flush()                # 0.05 s later would be too soon
+    assert sink.written == [(1,)]
+
+    now[0] += 0.1
+    sink.post((3,), 1.0)
+    sink.flush()
+    assert sink.written == [(1,), (3,)]
+
+class FailingSink(RecordingSink):
+    def open(self):
+        raise OSError("not yet")
+
+def test_led_init_retry_follows_backoff(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(nc.time, 'monotonic', lambda: now[0])
+    sink = FailingSink('test')
+    monkeypatch.setattr(nc, 'output_sinks', [sink])
+    assert nc.next_led_init_retry() == 0.0
+
+    sink.try_open()
+    assert nc.next_led_init_retry() == nc.LED_INIT_RETRY_MIN
+    now[0] += nc.LED_INIT_RETRY_MIN
+    sink.try_open()
+    assert nc.next_led_init_retry() == 2 * nc.LED_INIT_RETRY_MIN
+
+    sink.gave_up = True
+    assert nc.next_led_init_retry() is None
+
+@pytest.mark.skipif(not os.path.isdir('/dev/shm'), reason="needs POSIX shared memory in /dev/shm")
+def test_frame_bus_carries_the_frame_time():
+    segment = f'nerd_clock_test_{os.getpid()}'
+    sink = nc.SharedFrameSink('test', segment=segment)
+    assert sink.try_open()
+    reader = nc.FrameBusReader(segment)
+    try:
+        nc.frame_time = 50.0
+        sink.post(nc.BLANK_LED_FRAME, 1.0, 123.5)
+        sink.flush()
+        assert reader.read().time == 123.5
+    finally:
+        reader.close()
+        sink.close()
+        # The sink untracked the segment, so SharedMemory.unlink() would upset the resource tracker
+        os.unlink(os.path.join('/dev/shm', segment))
+
+def test_journal_refuses_to_overwrite_other_files(tmp_path):
+    notes = tmp_path / 'notes.txt'
+    notes.write_text("not a journal\n")
+    with pytest.raises(ValueError):
+        nc.FrameJournal(os.fspath(notes), size=4096, rows=5, cols=5)
+    assert notes.read_text() == "not a journal\n"
+
+    path = os.fspath(tmp_path / 'frames.ncj')
+    journal = nc.FrameJournal(path, size=4096, rows=5, cols=5)
+    journal.append(1.0, 3, 1.0, (0,) * 25)
+    journal.close()
+    journal = nc.FrameJournal(path, size=4096, rows=5, cols=5)
+    assert len(journal) == 1
+    journal.close()
+
+def test_metrics_server_keeps_files_at_its_socket_path(tmp_path):
+    path = tmp_path / 'metrics.sock'
+    path.write_text("keep\n")
+    assert nc.start_metrics_server(os.fspath(path)) is None
+    assert path.read_text() == "keep\n"
+
+def test_control_server_keeps_files_at_its_socket_path(tmp_path):
+    path = tmp_path / 'control.sock'
+    path.write_text("keep\n")
+    assert not nc.start_control_server(os.fspath(path))
+    assert path.read_text() == "keep\n"
+
+@pytest.mark.parametrize('day, mode', [
+    # New Year's runs from Dec 27 to the day before the first Monday of January
+    ('2026-01-04', 'newyears'),
+    ('2026-01-05', 'rainbow'),
+    ('2026-12-26', 'christmas'),
+    ('2026-12-27', 'newyears'),
+    ('2027-01-03', 'newyears'),
+    ('2027-01-04', 'rainbow'),
+    # Easter Sunday 2025-04-20, two weeks before to one week after
+    ('2025-04-05', 'rainbow'),
+    ('2025-04-06', 'easter'),
+    ('2025-04-20', 'easter'),
+    ('2025-04-27', 'easter'),
+    ('2025-04-28', 'rainbow'),
+    # Easter Sunday 2026-04-05: St. Patrick's week wins where they overlap
+    ('2026-03-22', 'stpatrick'),
+    ('2026-03-23', 'easter'),
+    ('2026-04-12', 'easter'),
+    ('2026-04-13', 'rainbow'),
+    # Holiday weeks, Monday to Sunday
+    ('2026-02-08', 'random'),
+    ('2026-02-09', 'valentine'),
+    ('2026-02-15', 'valentine'),
+    ('2026-02-16', 'random'),
+    ('2026-03-15', 'random'),
+    ('2026-03-16', 'stpatrick'),
+    ('2026-06-28', 'rainbow'),
+    ('2026-06-29', 'fourth'),
+    ('2026-07-05', 'fourth'),
+    ('2026-07-06', 'random'),
+    # Month seasons
+    ('2026-01-31', 'rainbow'),
+    ('2026-02-01', 'random'),
+    ('2026-07-31', 'random'),
+    ('2026-08-01', 'rainbow'),
+    ('2026-09-30', 'rainbow'),
+    ('2026-10-01', 'halloween'),
+    ('2026-10-31', 'halloween'),
+    ('2026-11-01', 'thanksgiving'),
+    ('2026-11-30', 'thanksgiving'),
+    ('2026-12-01', 'christmas'),
+])
+def test_seasonal_mode_for_date(day, mode):
+    assert nc.get_seasonal_mode_for_date(datetime.date.fromisoformat(day)) == mode
+
+def test_next_seasonal_transition_crosses_the_year():
+    assert nc.next_seasonal_transition(datetime.date(2026, 1, 1)) == datetime.datetime(2026, 1, 5)
+    assert nc.next_seasonal_transition(datetime.date(2026, 12, 27)) == datetime.datetime(2027, 1, 4)